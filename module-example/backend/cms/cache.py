@@ -0,0 +1,226 @@
+"""In-process caches for hot CMS read paths.
+
+Caches are process-local; every worker keeps its own copy. Writes that go
+through the CMS services invalidate the affected entries.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache with a per-entry time-to-live.
+
+    Thread-safe; values are stored as-is, so callers must not mutate them.
+    `None` is a valid cached value (used for negative lookups).
+
+    Every invalidation bumps `generation`. Loaders capture it before reading
+    the source and pass it to `set`, which then drops the value if an
+    invalidation happened meanwhile (it may predate the write).
+    """
+
+    def __init__(self, *, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.stats = CacheStats()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Return the cached value or `default` (raises KeyError if no default)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._data[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def set(self, key: Hashable, value: V, *, generation: Optional[int] = None) -> bool:
+        """Store `value`; skipped (returns False) if `generation` is given and stale."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._data[key] = (self._clock() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], V]) -> V:
+        """Return the cached value for `key`, calling `loader` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = loader()
+        self.set(key, value, generation=generation)
+        return value
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches `predicate`; returns the count dropped."""
+        with self._lock:
+            self._generation += 1
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                del self._data[k]
+            self.stats.invalidations += len(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.stats.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = asdict(self.stats)
+            data.update(size=len(self._data), maxsize=self.maxsize, ttl_seconds=self.ttl_seconds)
+            return data
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution.
+
+    The first caller (leader) runs `fn`; callers arriving while it is in flight
+    wait for and share its result or exception. Followers that wait longer
+    than `timeout` get `TimeoutError`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], V], *, timeout: Optional[float] = None) -> V:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"single-flight call for {key!r} still running")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        succeeded = False
+        try:
+            flight.value = fn()
+            succeeded = True
+            return flight.value
+        finally:
+            if not succeeded:
+                # Hand the in-flight exception to followers as well
+                flight.error = sys.exc_info()[1]
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+PUBLIC_BLOCK_CACHE_MAXSIZE = 512
+PUBLIC_BLOCK_CACHE_TTL_SECONDS = 60.0
+
+# (key, category) -> detached ServiceContentBlock copy, or None for a known miss
+public_block_cache: TTLCache[Optional[Any]] = TTLCache(
+    maxsize=PUBLIC_BLOCK_CACHE_MAXSIZE,
+    ttl_seconds=PUBLIC_BLOCK_CACHE_TTL_SECONDS,
+)
+
+
+COMPILED_TEMPLATE_CACHE_MAXSIZE = 256
+COMPILED_TEMPLATE_CACHE_TTL_SECONDS = 3600.0
+
+# (template id, updated_at, field, variables) -> rendering.CompiledTemplate.
+# Keys change whenever a template is edited, so entries never need invalidation.
+compiled_template_cache: TTLCache[Any] = TTLCache(
+    maxsize=COMPILED_TEMPLATE_CACHE_MAXSIZE,
+    ttl_seconds=COMPILED_TEMPLATE_CACHE_TTL_SECONDS,
+)
+
+
+COMPRESSED_BODY_CACHE_MAXSIZE = 256
+COMPRESSED_BODY_CACHE_TTL_SECONDS = 3600.0
+
+# (strong ETag of the identity body, coding) -> compressed bytes. The ETag is a
+# content hash, so each content revision is compressed once per process and
+# edits simply produce new keys; stale variants age out via LRU/TTL.
+compressed_body_cache: TTLCache[bytes] = TTLCache(
+    maxsize=COMPRESSED_BODY_CACHE_MAXSIZE,
+    ttl_seconds=COMPRESSED_BODY_CACHE_TTL_SECONDS,
+)
+
+
+NOTIFICATION_TEMPLATE_CACHE_TTL_SECONDS = 300.0
+
+# Single entry: the resolved snapshot of all active notification templates
+# (see notification_cache.py). Cleared on admin writes; the TTL bounds
+# staleness for writes made outside the CMS admin service.
+notification_template_cache: TTLCache[Any] = TTLCache(
+    maxsize=1,
+    ttl_seconds=NOTIFICATION_TEMPLATE_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_block_keys(*keys: Optional[str]) -> None:
+    """Drop cached lookups for the given block keys (any category)."""
+    wanted = {k for k in keys if k}
+    if not wanted:
+        return
+    public_block_cache.invalidate_where(lambda cache_key: cache_key[0] in wanted)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss/eviction counters for every CMS cache in this process."""
+    return {
+        "public_blocks": public_block_cache.snapshot_stats(),
+        "compiled_templates": compiled_template_cache.snapshot_stats(),
+        "compressed_bodies": compressed_body_cache.snapshot_stats(),
+        "notification_templates": notification_template_cache.snapshot_stats(),
+    }
@@ -0,0 +1,164 @@
+"""HTTP caching helpers for public CMS responses (ETag, Last-Modified, 304, content coding)."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+from .cache import compressed_body_cache
+
+try:  # optional; gzip is always available
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Browsers revalidate after a minute; shared caches (CDN) may hold longer and
+# serve stale while revalidating in the background.
+PUBLIC_CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+
+# Smaller bodies are not worth the CPU or the Content-Encoding header
+COMPRESS_MIN_BYTES = 512
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact, deterministic JSON encoding used for both body and ETag."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since is None:
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate conditional GET headers; If-None-Match takes precedence."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick `br` (when brotli is installed) or `gzip` from an Accept-Encoding header.
+
+    Honours q-values, including `q=0` exclusions and `*`; returns None for identity.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_body(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=5)
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    *,
+    media_type: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+    compressible: bool = False,
+) -> Response:
+    """Return `body` with validators, or an empty 304 when the client copy is current.
+
+    With `compressible=True` the body is gzip/brotli encoded per Accept-Encoding;
+    each coding gets its own ETag (`"<hash>-gzip"`) as required for strong validators.
+    Encoded variants are cached by content hash, so a given revision is
+    compressed once per process rather than on every request.
+    """
+    etag = strong_etag(body)
+    headers = {"Cache-Control": cache_control}
+    coding = None
+    if compressible:
+        headers["Vary"] = "Accept-Encoding"
+        if len(body) >= COMPRESS_MIN_BYTES:
+            coding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if coding:
+        etag = f'{etag[:-1]}-{coding}"'
+    headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if coding:
+        identity = body
+        body = compressed_body_cache.get_or_load((etag, coding), lambda: compress_body(identity, coding))
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def conditional_json_response(
+    request: Request,
+    payload: Dict[str, Any],
+    *,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+    compressible: bool = False,
+) -> Response:
+    """JSON variant of `conditional_response`."""
+    return conditional_response(
+        request,
+        encode_json(payload),
+        media_type="application/json",
+        last_modified=last_modified,
+        cache_control=cache_control,
+        compressible=compressible,
+    )
@@ -0,0 +1,187 @@
+"""Cross-worker invalidation bus for CMS caches.
+
+Writes in `ContentBlockService` / `EmailTemplateService` publish the changed
+keys; every worker subscribed to the bus drops those keys from its in-process
+caches. Two backends are provided:
+
+- `InProcessBackend` (default): delivers to subscribers in the publishing
+  process only. Used in tests and single-worker deployments.
+- `PostgresNotifyBackend`: publishes with `pg_notify` inside the writing
+  transaction (so other workers hear about it only after commit) and runs a
+  background `LISTEN` thread per process.
+
+Wire the Postgres backend once at application startup::
+
+    bus = configure_invalidation_bus(PostgresNotifyBackend(settings.DATABASE_URL))
+    bus.start()
+"""
+from __future__ import annotations
+
+import json
+import logging
+import select
+from abc import ABC, abstractmethod
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from .cache import invalidate_block_keys, notification_template_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cms_invalidation"
+# pg_notify payloads must stay below 8000 bytes; split large key sets
+_MAX_PAYLOAD_BYTES = 7000
+
+Handler = Callable[[str, List[str]], None]
+
+
+class InvalidationBackend(ABC):
+    """Base backend: keeps the local subscriber list and dispatches events to it."""
+
+    def __init__(self) -> None:
+        self._handlers: List[Handler] = []
+
+    def subscribe(self, handler: Handler) -> None:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def unsubscribe(self, handler: Handler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    @abstractmethod
+    def publish(self, db: Any, entity_type: str, keys: List[str]) -> None:
+        """Deliver `keys` to every worker's subscribers."""
+
+    def start(self) -> "InvalidationBackend":
+        return self
+
+    def stop(self) -> None:
+        return None
+
+    def _dispatch(self, entity_type: str, keys: List[str]) -> None:
+        for handler in list(self._handlers):
+            handler(entity_type, keys)
+
+
+class InProcessBackend(InvalidationBackend):
+    def publish(self, db: Any, entity_type: str, keys: List[str]) -> None:
+        if keys:
+            self._dispatch(entity_type, keys)
+
+
+class PostgresNotifyBackend(InvalidationBackend):
+    """LISTEN/NOTIFY backend (requires psycopg2 for the listener thread)."""
+
+    def __init__(self, dsn: str, *, channel: str = CHANNEL, poll_seconds: float = 5.0, retry_seconds: float = 2.0):
+        super().__init__()
+        self.dsn = dsn.replace("postgresql+psycopg2://", "postgresql://", 1)
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, db: Any, entity_type: str, keys: List[str]) -> None:
+        for payload in self._payloads(entity_type, keys):
+            # Transactional: delivered to listeners only when `db` commits
+            db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+
+    @staticmethod
+    def _payloads(entity_type: str, keys: List[str]) -> List[str]:
+        payloads: List[str] = []
+        batch: List[str] = []
+        for key in keys:
+            candidate = json.dumps({"type": entity_type, "keys": [*batch, key]})
+            if batch and len(candidate.encode("utf-8")) > _MAX_PAYLOAD_BYTES:
+                payloads.append(json.dumps({"type": entity_type, "keys": batch}))
+                batch = []
+            batch.append(key)
+        if batch:
+            payloads.append(json.dumps({"type": entity_type, "keys": batch}))
+        return payloads
+
+    def start(self) -> "PostgresNotifyBackend":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cms-invalidation-listener", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+    def _run(self) -> None:
+        import psycopg2  # optional dependency, only needed for the listener
+
+        while not self._stop.is_set():
+            try:
+                self._listen(psycopg2.connect(self.dsn))
+            except psycopg2.Error:
+                logger.warning("CMS invalidation listener lost its connection; retrying", exc_info=True)
+                self._stop.wait(self.retry_seconds)
+
+    def _listen(self, conn: Any) -> None:
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            while not self._stop.is_set():
+                if select.select([conn], [], [], self.poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._handle(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _handle(self, payload: str) -> None:
+        try:
+            event: Dict[str, Any] = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed CMS invalidation payload: %r", payload)
+            return
+        self._dispatch(str(event.get("type")), [str(k) for k in event.get("keys") or []])
+
+
+_bus: InvalidationBackend = InProcessBackend()
+_default_handlers: List[Handler] = []
+
+
+def get_invalidation_bus() -> InvalidationBackend:
+    return _bus
+
+
+def configure_invalidation_bus(backend: InvalidationBackend) -> InvalidationBackend:
+    """Swap the process-wide backend, carrying over the default cache subscribers."""
+    global _bus
+    _bus.stop()
+    for handler in _default_handlers:
+        backend.subscribe(handler)
+    _bus = backend
+    return backend
+
+
+def subscribe_default(handler: Handler) -> None:
+    """Register a cache invalidation handler that survives backend swaps."""
+    _default_handlers.append(handler)
+    _bus.subscribe(handler)
+
+
+def publish_invalidation(db: Any, entity_type: str, keys: List[str]) -> None:
+    """Announce changed keys to every worker's caches."""
+    _bus.publish(db, entity_type, [k for k in keys if k])
+
+
+def _invalidate_local_caches(entity_type: str, keys: List[str]) -> None:
+    if entity_type == "block":
+        invalidate_block_keys(*keys)
+    elif entity_type == "notification_template":
+        notification_template_cache.clear()
+
+
+subscribe_default(_invalidate_local_caches)
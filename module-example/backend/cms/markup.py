@@ -0,0 +1,38 @@
+"""Markdown -> sanitized HTML for Markdown-authored CMS blocks (e.g. terms of service).
+
+Rendering happens once at write time and the result is stored in
+`ServiceContentBlock.content_html`, so readers never parse Markdown per view.
+Needs the optional `markdown` and `nh3` packages; without them
+`render_markdown` returns None and clients keep rendering `content_md`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_EXTENSIONS = ("extra", "sane_lists")
+
+_warned_unavailable = False
+
+
+def render_markdown(source: Optional[str]) -> Optional[str]:
+    """Render `source` to HTML and strip anything outside the sanitizer allowlist.
+
+    Raw HTML in the source is sanitized too (scripts, event handlers and
+    `javascript:` URLs are removed). Returns None when the renderer is unavailable.
+    """
+    global _warned_unavailable
+    if not source or not source.strip():
+        return None
+    try:
+        import markdown
+        import nh3
+    except ImportError:
+        if not _warned_unavailable:
+            logger.warning("markdown/nh3 not installed; CMS Markdown blocks are stored without content_html")
+            _warned_unavailable = True
+        return None
+    html = markdown.markdown(source, extensions=list(MARKDOWN_EXTENSIONS), output_format="html")
+    return nh3.clean(html).strip() or None
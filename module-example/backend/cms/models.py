@@ -4,8 +4,12 @@ from __future__ import annotations
 from typing import List, Optional
 from sqlmodel import Field, Column, JSON
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from app.shared.base_model import BaseServiceModel
 
+# JSONB on Postgres so the GIN index below can serve `placeholders @> '["name"]'`
+_PLACEHOLDERS_TYPE = sa.JSON().with_variant(JSONB(), "postgresql")
+
 
 class ServiceContentBlock(BaseServiceModel, table=True):
     """Generic content block for admin-managed HTML snippets.
@@ -18,8 +22,13 @@ class ServiceContentBlock(BaseServiceModel, table=True):
     category: str = Field(default="content", index=True, max_length=100)
     title: str = Field(max_length=255)
     html_content: str = Field(sa_column=Column("html_content", sa.Text()))
+    # Sanitized HTML rendered at write time for Markdown blocks (see service.MARKDOWN_BLOCK_KEYS)
+    content_html: Optional[str] = Field(default=None, sa_column=Column("content_html", sa.Text(), nullable=True))
     description: Optional[str] = Field(default=None, max_length=255)
     variables: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    # Placeholder names found in html_content, extracted on write (rendering.extract_placeholders)
+    placeholders: List[str] = Field(default_factory=list, sa_column=Column("placeholders", _PLACEHOLDERS_TYPE))
+    revision: int = Field(default=0, index=True)  # id of the latest ServiceCMSChange for this row
 
 
 class ServiceEmailTemplate(BaseServiceModel, table=True):
@@ -32,3 +41,58 @@ class ServiceEmailTemplate(BaseServiceModel, table=True):
     body_html: str = Field(sa_column=Column("body_html", sa.Text()))
     variables: List[str] = Field(default_factory=list, sa_column=Column(JSON))
     is_active: bool = Field(default=True)
+    # Placeholder names found in subject_template + body_html, extracted on write
+    placeholders: List[str] = Field(default_factory=list, sa_column=Column("placeholders", _PLACEHOLDERS_TYPE))
+    revision: int = Field(default=0, index=True)  # id of the latest ServiceCMSChange for this row
+
+
+class ServiceCMSChange(BaseServiceModel, table=True):
+    """Append-only CMS change log; the autoincrement id is the global revision.
+
+    One row per written or deleted block/template key, so caches can sync
+    deltas (`GET /cms/changes?since=<revision>`) instead of refetching.
+    """
+    __tablename__ = "service_cms_changes"
+
+    entity_type: str = Field(max_length=32, index=True)  # "block" | "email_template"
+    key: str = Field(max_length=100)
+    action: str = Field(max_length=16)  # "upsert" | "delete"
+
+
+def _trigram_index(table: sa.Table, column: str) -> sa.Index:
+    """GIN trigram index so `ILIKE '%term%'` avoids a sequential scan (Postgres + pg_trgm only)."""
+    return sa.Index(
+        f"ix_{table.name}_{column}_trgm",
+        table.c[column],
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+# Back the full-text search mode of EmailTemplateRepository.search
+_trigram_index(ServiceEmailTemplate.__table__, "name")
+_trigram_index(ServiceEmailTemplate.__table__, "subject_template")
+_trigram_index(ServiceEmailTemplate.__table__, "body_html")
+
+
+def _placeholder_index(table: sa.Table) -> sa.Index:
+    """GIN index for placeholder containment lookups (Postgres only)."""
+    return sa.Index(
+        f"ix_{table.name}_placeholders",
+        table.c.placeholders,
+        postgresql_using="gin",
+        postgresql_ops={"placeholders": "jsonb_path_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+# Back "which templates/blocks use variable X" (repository.find_by_placeholder)
+_placeholder_index(ServiceContentBlock.__table__)
+_placeholder_index(ServiceEmailTemplate.__table__)
+
+
+# Index for NotificationTemplateRepository._filtered_rows: the admin table filters by
+# template_type (or nothing), then pages by id. The table belongs to app.notifications,
+# so its migration creates the index from these names; attaching it here would make
+# the notifications schema depend on whether the CMS module was imported.
+NOTIFICATION_TEMPLATE_LISTING_INDEX = "ix_notification_templates_type_category_active"
+NOTIFICATION_TEMPLATE_LISTING_COLUMNS = ("template_type", "category", "is_active", "id")
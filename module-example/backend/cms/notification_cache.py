@@ -0,0 +1,80 @@
+"""Resolved notification template cache for dispatch.
+
+Notification sends look templates up by `(name, template_type)` or by
+category. Instead of a query per message, all active templates are loaded in
+one query into an immutable snapshot shared by the process. The snapshot is
+dropped by `NotificationTemplateAdminService` writes (locally and on other
+workers via the invalidation bus) and otherwise refreshed after
+`NOTIFICATION_TEMPLATE_CACHE_TTL_SECONDS`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.notifications.models import NotificationTemplate
+
+from .cache import SingleFlight, notification_template_cache
+from .repository import NotificationTemplateRepository
+
+_SNAPSHOT_KEY = "active"
+_load_flight = SingleFlight()
+
+
+@dataclass(frozen=True)
+class NotificationTemplateSnapshot:
+    """Detached active templates grouped for lookup; treat as read-only."""
+
+    by_name_type: Dict[Tuple[str, str], NotificationTemplate] = field(default_factory=dict)
+    by_category: Dict[str, Tuple[NotificationTemplate, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, templates: List[NotificationTemplate]) -> "NotificationTemplateSnapshot":
+        by_name_type: Dict[Tuple[str, str], NotificationTemplate] = {}
+        by_category: Dict[str, List[NotificationTemplate]] = {}
+        for tpl in templates:
+            copy = NotificationTemplate(**tpl.model_dump())
+            # Lowest id wins for duplicate (name, type) pairs, like an ordered `.first()`
+            by_name_type.setdefault((copy.name, copy.template_type), copy)
+            by_category.setdefault(copy.category, []).append(copy)
+        return cls(
+            by_name_type=by_name_type,
+            by_category={category: tuple(items) for category, items in by_category.items()},
+        )
+
+
+class NotificationTemplateResolver:
+    """Cached read path for notification dispatch (active templates only)."""
+
+    def __init__(self, db: Session):
+        self.repo = NotificationTemplateRepository(db)
+
+    def snapshot(self) -> NotificationTemplateSnapshot:
+        try:
+            return notification_template_cache.get(_SNAPSHOT_KEY)
+        except KeyError:
+            # Concurrent misses share one load instead of all querying the table
+            return _load_flight.do(_SNAPSHOT_KEY, self._load)
+
+    def _load(self) -> NotificationTemplateSnapshot:
+        # A write invalidating mid-query must not get its pre-write snapshot re-installed
+        generation = notification_template_cache.generation
+        snapshot = NotificationTemplateSnapshot.build(self.repo.list_active())
+        notification_template_cache.set(_SNAPSHOT_KEY, snapshot, generation=generation)
+        return snapshot
+
+    def get(self, name: str, template_type: str) -> Optional[NotificationTemplate]:
+        return self.snapshot().by_name_type.get((name, template_type))
+
+    def for_category(self, category: str, template_type: Optional[str] = None) -> List[NotificationTemplate]:
+        templates = self.snapshot().by_category.get(category, ())
+        if template_type is None:
+            return list(templates)
+        return [tpl for tpl in templates if tpl.template_type == template_type]
+
+
+def invalidate_notification_templates() -> None:
+    """Drop this process's snapshot; the next lookup reloads it."""
+    notification_template_cache.clear()
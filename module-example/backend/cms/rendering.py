@@ -0,0 +1,273 @@
+"""Precompiled rendering for CMS email templates.
+
+Templates mix `{var}` and `{{ var }}` placeholders. Each source string is
+parsed once into alternating literal fragments and variable slots; rendering
+is then a single join instead of repeated scan-and-replace over the HTML.
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .cache import compiled_template_cache
+
+# `{{ name }}` (any inner whitespace) or bare `{name}`; CSS rules such as
+# `a { color: red }` never match because the body must be a single identifier.
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class TemplateRenderError(ValueError):
+    """Raised when a render context does not satisfy a compiled template."""
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split into `len(names) + 1` literals around `names` slots."""
+
+    literals: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+    @property
+    def placeholders(self) -> FrozenSet[str]:
+        return frozenset(self.names)
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        missing = self.placeholders.difference(context)
+        if missing:
+            raise TemplateRenderError(f"Missing template variables: {', '.join(sorted(missing))}")
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = context[name]
+            parts.append("" if value is None else str(value))
+            parts.append(literal)
+        return "".join(parts)
+
+    def partial(self, context: Mapping[str, Any]) -> "CompiledTemplate":
+        """Bake the values present in `context` into the literals.
+
+        Used for values shared by every recipient (app URL, style, footer) so a
+        batch render only substitutes the per-recipient slots.
+        """
+        literals = [self.literals[0]]
+        names = []
+        for name, literal in zip(self.names, self.literals[1:]):
+            if name in context:
+                value = context[name]
+                literals[-1] += ("" if value is None else str(value)) + literal
+            else:
+                names.append(name)
+                literals.append(literal)
+        return CompiledTemplate(literals=tuple(literals), names=tuple(names))
+
+
+def extract_placeholders(*sources: Optional[str]) -> List[str]:
+    """Sorted, de-duplicated placeholder names used across `sources`.
+
+    Stored on templates/blocks at write time (`placeholders` column) so
+    renders and "which templates use X" queries never rescan the bodies.
+    """
+    names = set()
+    for source in sources:
+        for match in PLACEHOLDER_RE.finditer(source or ""):
+            names.add(match.group(1) or match.group(2))
+    return sorted(names)
+
+
+def compile_template(source: str, *, allowed: Optional[Iterable[str]] = None) -> CompiledTemplate:
+    """Parse `source` into a CompiledTemplate.
+
+    When `allowed` is given, only those names become slots; any other
+    placeholder-looking token is kept verbatim as literal text.
+    """
+    allowed_set = None if allowed is None else frozenset(allowed)
+    literals = []
+    names = []
+    pos = 0
+    buf = ""
+    for match in PLACEHOLDER_RE.finditer(source):
+        name = match.group(1) or match.group(2)
+        if allowed_set is not None and name not in allowed_set:
+            continue
+        buf += source[pos:match.start()]
+        literals.append(buf)
+        names.append(name)
+        buf = ""
+        pos = match.end()
+    literals.append(buf + source[pos:])
+    return CompiledTemplate(literals=tuple(literals), names=tuple(names))
+
+
+def get_compiled(template: Any, field: str) -> CompiledTemplate:
+    """Compiled form of `template.<field>`, cached per template id and `updated_at`.
+
+    Only the template's declared `variables` become substitution slots.
+    """
+    variables = tuple(getattr(template, "variables", None) or ())
+    source = getattr(template, field) or ""
+    template_id = getattr(template, "id", None)
+    if template_id is None:
+        # Unsaved templates have no stable identity; key on the source itself
+        key: Tuple[Any, ...] = ("source", field, source, variables)
+    else:
+        key = (template_id, getattr(template, "updated_at", None), field, variables)
+    return compiled_template_cache.get_or_load(key, lambda: compile_template(source, allowed=variables))
+
+
+RENDER_BATCH_CHUNK_SIZE = 250
+# Below this many contexts, shipping chunks to worker processes costs more than it saves
+RENDER_POOL_MIN_CONTEXTS = 1000
+# Size of the process-wide render pool (fixed when the pool is first created)
+RENDER_POOL_WORKERS = int(os.getenv("CMS_RENDER_POOL_WORKERS", "0")) or os.cpu_count() or 1
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Process-wide render pool, created on first use.
+
+    Workers are spawned rather than forked: ASGI workers run threads, and
+    forking a threaded process can copy held locks into the child.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=RENDER_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool; call from the application's shutdown hook."""
+    global _render_pool
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_render_pool)
+
+
+def _render_chunk(
+    chunk: List[Mapping[str, Any]],
+    templates: Tuple[CompiledTemplate, CompiledTemplate],
+) -> List[Tuple[str, str]]:
+    subject, body = templates
+    return [(subject.render(ctx), body.render(ctx)) for ctx in chunk]
+
+
+def render_batch(
+    subject: CompiledTemplate,
+    body: CompiledTemplate,
+    contexts: Iterable[Mapping[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = RENDER_BATCH_CHUNK_SIZE,
+) -> Iterator[Tuple[str, str]]:
+    """Yield `(subject, html)` per context, in input order.
+
+    Contexts are consumed lazily in chunks. Batches under
+    `RENDER_POOL_MIN_CONTEXTS`, or `workers=1`, render in-process; larger ones
+    go to the shared render pool. The pool's size is `RENDER_POOL_WORKERS`
+    (env `CMS_RENDER_POOL_WORKERS`, default one per CPU); `workers` only caps
+    this batch's share of it at `2 * workers` chunks in flight (default: the
+    pool size), which also bounds memory. Contexts must be picklable.
+    """
+    workers = workers or RENDER_POOL_WORKERS
+    templates = (subject, body)
+    chunks = _chunked(contexts, chunk_size)
+    head: List[List[Mapping[str, Any]]] = []
+    buffered = 0
+    while buffered < RENDER_POOL_MIN_CONTEXTS and (chunk := next(chunks, None)) is not None:
+        head.append(chunk)
+        buffered += len(chunk)
+    if workers <= 1 or buffered < RENDER_POOL_MIN_CONTEXTS:
+        for chunk in chain(head, chunks):
+            yield from _render_chunk(chunk, templates)
+        return
+
+    pool = _get_render_pool()
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in chain(head, chunks):
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_render_chunk, chunk, templates))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+# Built-in EmailTemplates output only changes with a deploy; set APP_VERSION so
+# a new release never reuses renders memoized by a previous one in the same process.
+APP_VERSION = os.getenv("APP_VERSION", "dev")
+
+
+class MemoizedEmailTemplates:
+    """Process-wide memo over `app.email.templates.EmailTemplates` placeholder renders.
+
+    Default seeding renders the built-in invitation/reset/usage HTML and the
+    notification style with placeholder contexts; the output is deterministic
+    per code version, so it is computed once per `(kind, APP_VERSION, context)`
+    and shared by every tenant import. EmailTemplates itself is only
+    constructed on a memo miss.
+    """
+
+    _memo: Dict[Tuple[Any, ...], str] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, db: Any):
+        self._db = db
+        self._templates: Any = None
+
+    def _email_templates(self) -> Any:
+        if self._templates is None:
+            from app.email.templates import EmailTemplates  # local import to avoid cycles
+
+            self._templates = EmailTemplates(self._db)
+        return self._templates
+
+    def _memoized(self, kind: str, context: Optional[Mapping[str, Any]], render: Callable[[Any], str]) -> str:
+        key = (kind, APP_VERSION, tuple(sorted((context or {}).items())))
+        cached = self._memo.get(key)
+        if cached is None:
+            cached = render(self._email_templates())
+            with self._lock:
+                self._memo[key] = cached
+        return cached
+
+    @property
+    def notification_style(self) -> str:
+        return self._memoized("notification_style", None, lambda t: t.notification_style)
+
+    def render_invitation(self, context: Mapping[str, Any]) -> str:
+        return self._memoized("invitation", context, lambda t: t.render_invitation(dict(context)))
+
+    def render_password_reset(self, context: Mapping[str, Any]) -> str:
+        return self._memoized("password_reset", context, lambda t: t.render_password_reset(dict(context)))
+
+    def render_usage_alert(self, context: Mapping[str, Any]) -> str:
+        return self._memoized("usage_alert", context, lambda t: t.render_usage_alert(dict(context)))
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._memo.clear()
@@ -1,12 +1,42 @@
 """Repositories for CMS content blocks and email templates."""
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 from sqlmodel import Session, select
-from sqlalchemy import func
+import sqlalchemy as sa
+from sqlalchemy import Row, case, func, or_
+from sqlalchemy.dialects.postgresql import JSONB
 
 from app.shared.repositories.base import BaseRepository
-from .models import ServiceContentBlock, ServiceEmailTemplate
+from app.notifications.models import NotificationTemplate
+from .models import ServiceCMSChange, ServiceContentBlock, ServiceEmailTemplate
+
+
+def _rows_using_placeholder(db: Session, columns: Sequence[Any], placeholders: Any, name: str) -> List[Dict[str, Any]]:
+    """Rows whose stored `placeholders` list contains `name`.
+
+    Postgres uses JSONB containment (GIN-indexed, see models.py); other
+    dialects pre-filter on the JSON text and confirm membership in Python.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        condition = sa.type_coerce(placeholders, JSONB).contains([name])
+    else:
+        condition = sa.cast(placeholders, sa.Text).like(f'%"{name}"%')
+    stmt = select(*columns, placeholders).where(condition).order_by(columns[0])
+    rows = [dict(row) for row in db.exec(stmt).mappings().all()]
+    return [row for row in rows if name in (row["placeholders"] or [])]
+
+
+def _placeholder_sources(db: Session, model: Any, columns: Sequence[Any], after_id: int, limit: int) -> List[Dict[str, Any]]:
+    """One id-ordered batch of `id`, `columns` and stored `placeholders`, for re-indexing."""
+    stmt = select(model.id, *columns, model.placeholders).where(model.id > after_id).order_by(model.id).limit(limit)
+    return [dict(row) for row in db.exec(stmt).mappings().all()]
+
+
+def _set_placeholders(db: Session, model: Any, values: Dict[int, List[str]]) -> None:
+    """Bulk UPDATE of `placeholders` by primary key; the caller commits."""
+    if values:
+        db.execute(sa.update(model), [{"id": row_id, "placeholders": names} for row_id, names in values.items()])
 
 
 class ContentBlockRepository(BaseRepository[ServiceContentBlock]):
@@ -19,13 +49,99 @@ class ContentBlockRepository(BaseRepository[ServiceContentBlock]):
             stmt = stmt.where(ServiceContentBlock.category == category)
         return self.db.exec(stmt).first()
 
-    def list_all(self, *, category: Optional[str] = None) -> List[ServiceContentBlock]:
-        stmt = select(ServiceContentBlock)
+    def get_many_by_keys(self, keys: Iterable[str], category: Optional[str] = None) -> Dict[str, ServiceContentBlock]:
+        """Fetch several blocks with a single `IN (...)` query, keyed by block key."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        stmt = select(ServiceContentBlock).where(ServiceContentBlock.key.in_(wanted))
+        if category:
+            stmt = stmt.where(ServiceContentBlock.category == category)
+        return {blk.key: blk for blk in self.db.exec(stmt).all()}
+
+    def existing_keys(self, keys: Iterable[str]) -> set[str]:
+        """Return which of `keys` already exist, selecting only the key column."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return set()
+        stmt = select(ServiceContentBlock.key).where(ServiceContentBlock.key.in_(wanted))
+        return set(self.db.exec(stmt).all())
+
+    def create_many(self, entities: List[ServiceContentBlock]) -> None:
+        """Insert all entities with one flush (batched INSERT) and one commit."""
+        if not entities:
+            return
+        self.db.add_all(entities)
+        self.db.commit()
+
+    def list_all(
+        self,
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[ServiceContentBlock]:
+        stmt = self._listing(select(ServiceContentBlock), category=category, after_id=after_id, limit=limit)
+        return list(self.db.exec(stmt).all())
+
+    def list_rows(
+        self,
+        columns: Sequence[str],
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Like `list_all`, but selects only `columns` into plain dicts (no ORM instances)."""
+        stmt = select(*(getattr(ServiceContentBlock, name) for name in columns))
+        stmt = self._listing(stmt, category=category, after_id=after_id, limit=limit)
+        return [dict(row) for row in self.db.exec(stmt).mappings().all()]
+
+    @staticmethod
+    def _listing(stmt: Any, *, category: Optional[str], after_id: Optional[int], limit: Optional[int]) -> Any:
+        """Apply the category filter, keyset cursor and id ordering shared by block listings."""
         if category:
             stmt = stmt.where(ServiceContentBlock.category == category)
+        if after_id is not None:
+            stmt = stmt.where(ServiceContentBlock.id > after_id)
         stmt = stmt.order_by(ServiceContentBlock.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def list_summaries(
+        self,
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Row]:
+        """Keyset-paged listing without the content body (only its length)."""
+        stmt = select(
+            ServiceContentBlock.id,
+            ServiceContentBlock.key,
+            ServiceContentBlock.category,
+            ServiceContentBlock.title,
+            ServiceContentBlock.description,
+            ServiceContentBlock.variables,
+            ServiceContentBlock.updated_at,
+            ServiceContentBlock.revision,
+            func.length(ServiceContentBlock.html_content).label("content_length"),
+        )
+        stmt = self._listing(stmt, category=category, after_id=after_id, limit=limit)
         return list(self.db.exec(stmt).all())
 
+    def find_by_placeholder(self, name: str) -> List[Dict[str, Any]]:
+        columns = [ServiceContentBlock.id, ServiceContentBlock.key, ServiceContentBlock.category]
+        return _rows_using_placeholder(self.db, columns, ServiceContentBlock.placeholders, name)
+
+    def placeholder_sources(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        columns = [ServiceContentBlock.key, ServiceContentBlock.category, ServiceContentBlock.html_content]
+        return _placeholder_sources(self.db, ServiceContentBlock, columns, after_id, limit)
+
+    def set_placeholders(self, values: Dict[int, List[str]]) -> None:
+        _set_placeholders(self.db, ServiceContentBlock, values)
+
 
 class EmailTemplateRepository(BaseRepository[ServiceEmailTemplate]):
     def __init__(self, db: Session):
@@ -35,12 +151,286 @@ class EmailTemplateRepository(BaseRepository[ServiceEmailTemplate]):
         stmt = select(ServiceEmailTemplate).where(ServiceEmailTemplate.name == name)
         return self.db.exec(stmt).first()
 
-    def search(self, *, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> Tuple[List[ServiceEmailTemplate], int]:
+    def get_many_by_names(self, names: Iterable[str]) -> Dict[str, ServiceEmailTemplate]:
+        """Fetch several templates with a single `IN (...)` query, keyed by name."""
+        wanted = list(dict.fromkeys(names))
+        if not wanted:
+            return {}
+        stmt = select(ServiceEmailTemplate).where(ServiceEmailTemplate.name.in_(wanted))
+        return {tpl.name: tpl for tpl in self.db.exec(stmt).all()}
+
+    def upsert_by_name(self, rows: List[Dict[str, Any]], *, update_fields: Iterable[str]) -> None:
+        """Insert or update `rows` keyed on the unique `name`, in one transaction.
+
+        Postgres and SQLite use a single `INSERT ... ON CONFLICT (name) DO UPDATE`
+        that overwrites `update_fields` (and `updated_at`); other dialects fall
+        back to per-row merges before the same single commit.
+        """
+        if not rows:
+            return
+        fields = [f for f in update_fields if f != "name"]
+        if "updated_at" in rows[0]:
+            fields.append("updated_at")
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+        if insert is not None:
+            stmt = insert(ServiceEmailTemplate).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ServiceEmailTemplate.name],
+                set_={f: stmt.excluded[f] for f in fields},
+            )
+            self.db.execute(stmt)
+        else:
+            existing = self.get_many_by_names(row["name"] for row in rows)
+            for row in rows:
+                entity = existing.get(row["name"])
+                if entity is None:
+                    self.db.add(ServiceEmailTemplate(**row))
+                    continue
+                for f in fields:
+                    setattr(entity, f, row[f])
+                self.db.add(entity)
+        self.db.commit()
+
+    def search(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        mode: Literal["name", "full"] = "name",
+        after_id: Optional[int] = None,
+        include_total: bool = False,
+    ) -> Tuple[List[ServiceEmailTemplate], Optional[int]]:
+        """Page through templates.
+
+        `mode="name"` filters on name and orders by id. With `after_id` the page
+        is a keyset seek (`id > after_id`) and `skip` is ignored.
+        `mode="full"` matches name, subject and body and orders by relevance
+        (see `_full_text_rank`); it pages with `skip` only.
+        The total is only counted when `include_total` is set; otherwise `None`
+        is returned in its place.
+        """
         base = select(ServiceEmailTemplate)
+        rank = None
         if search:
             like = f"%{search}%"
-            base = base.where(ServiceEmailTemplate.name.ilike(like))
-        total_stmt = select(func.count()).select_from(base.subquery())
-        total = int(self.db.exec(total_stmt).one())
-        items = list(self.db.exec(base.order_by(ServiceEmailTemplate.id).offset(skip).limit(limit)).all())
+            if mode == "full":
+                base = base.where(
+                    or_(
+                        ServiceEmailTemplate.name.ilike(like),
+                        ServiceEmailTemplate.subject_template.ilike(like),
+                        ServiceEmailTemplate.body_html.ilike(like),
+                    )
+                )
+                rank = self._full_text_rank(search)
+            else:
+                base = base.where(ServiceEmailTemplate.name.ilike(like))
+        total: Optional[int] = None
+        if include_total:
+            total_stmt = select(func.count()).select_from(base.subquery())
+            total = int(self.db.exec(total_stmt).one())
+        if rank is not None:
+            page = base.order_by(*rank, ServiceEmailTemplate.id).offset(skip)
+        else:
+            page = base.order_by(ServiceEmailTemplate.id)
+            if after_id is not None:
+                page = page.where(ServiceEmailTemplate.id > after_id)
+            elif skip:
+                page = page.offset(skip)
+        items = list(self.db.exec(page.limit(limit)).all())
         return items, total
+
+    def _full_text_rank(self, term: str) -> list:
+        """ORDER BY terms: name hits outrank subject hits, which outrank body hits.
+
+        On Postgres the trigram similarity of the name breaks ties; the
+        `ILIKE` filters themselves are served by the pg_trgm GIN indexes.
+        """
+        like = f"%{term}%"
+        weight = (
+            case((ServiceEmailTemplate.name.ilike(like), 4), else_=0)
+            + case((ServiceEmailTemplate.subject_template.ilike(like), 2), else_=0)
+            + case((ServiceEmailTemplate.body_html.ilike(like), 1), else_=0)
+        )
+        order = [weight.desc()]
+        if self.db.get_bind().dialect.name == "postgresql":
+            order.append(func.similarity(ServiceEmailTemplate.name, term).desc())
+        return order
+
+    def find_by_placeholder(self, name: str) -> List[Dict[str, Any]]:
+        columns = [ServiceEmailTemplate.id, ServiceEmailTemplate.name, ServiceEmailTemplate.category]
+        return _rows_using_placeholder(self.db, columns, ServiceEmailTemplate.placeholders, name)
+
+    def placeholder_sources(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        columns = [ServiceEmailTemplate.subject_template, ServiceEmailTemplate.body_html]
+        return _placeholder_sources(self.db, ServiceEmailTemplate, columns, after_id, limit)
+
+    def set_placeholders(self, values: Dict[int, List[str]]) -> None:
+        _set_placeholders(self.db, ServiceEmailTemplate, values)
+
+
+class NotificationTemplateRepository(BaseRepository[NotificationTemplate]):
+    """Set-based helpers for NotificationTemplate (single-row CRUD stays in NotificationRepository)."""
+
+    def __init__(self, db: Session):
+        super().__init__(db, NotificationTemplate)
+
+    def list_by_names(self, names: Iterable[str]) -> List[NotificationTemplate]:
+        wanted = list(dict.fromkeys(names))
+        if not wanted:
+            return []
+        stmt = select(NotificationTemplate).where(NotificationTemplate.name.in_(wanted))
+        return list(self.db.exec(stmt).all())
+
+    def list_rows(self, columns: Sequence[str], **filters: Any) -> List[Dict[str, Any]]:
+        """Selected columns as dicts; see `_filtered_rows` for the filters."""
+        return self._filtered_rows([getattr(NotificationTemplate, name) for name in columns], **filters)
+
+    def list_summaries(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Admin table rows: everything but the body, plus its length (`body_length`)."""
+        selectables = [
+            NotificationTemplate.id,
+            NotificationTemplate.name,
+            NotificationTemplate.template_type,
+            NotificationTemplate.category,
+            NotificationTemplate.subject_template,
+            NotificationTemplate.variables,
+            NotificationTemplate.is_active,
+            NotificationTemplate.is_default,
+            func.length(NotificationTemplate.body_template).label("body_length"),
+        ]
+        return self._filtered_rows(selectables, **filters)
+
+    def _filtered_rows(
+        self,
+        selectables: List[Any],
+        *,
+        template_type: Optional[str] = None,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        is_default: Optional[bool] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Filtered, keyset-paged (by id) projection.
+
+        `template_type` filters (the admin table's type selector), optionally
+        narrowed by category and is_active, are served in id order by the
+        `NOTIFICATION_TEMPLATE_LISTING_COLUMNS` index (models.py) that the
+        notifications migration creates. Unfiltered listings walk the primary key.
+        """
+        stmt = select(*selectables)
+        if template_type:
+            stmt = stmt.where(NotificationTemplate.template_type == template_type)
+        if category:
+            stmt = stmt.where(NotificationTemplate.category == category)
+        if is_active is not None:
+            stmt = stmt.where(NotificationTemplate.is_active.is_(is_active))
+        if is_default is not None:
+            stmt = stmt.where(NotificationTemplate.is_default.is_(is_default))
+        if after_id is not None:
+            stmt = stmt.where(NotificationTemplate.id > after_id)
+        stmt = stmt.order_by(NotificationTemplate.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [dict(row) for row in self.db.exec(stmt).mappings().all()]
+
+    def list_by_ids(self, ids: Iterable[int]) -> List[NotificationTemplate]:
+        wanted = list(dict.fromkeys(ids))
+        if not wanted:
+            return []
+        stmt = select(NotificationTemplate).where(NotificationTemplate.id.in_(wanted))
+        return list(self.db.exec(stmt).all())
+
+    def apply_changes(
+        self,
+        *,
+        create: List[NotificationTemplate],
+        update: List[NotificationTemplate],
+        delete: List[NotificationTemplate],
+    ) -> List[int]:
+        """Persist inserts, updates and deletes with one flush and a single commit.
+
+        Returns the ids assigned to `create`, read before the commit expires them.
+        """
+        self.db.add_all([*create, *update])
+        for entity in delete:
+            self.db.delete(entity)
+        self.db.flush()
+        created_ids = [entity.id for entity in create]
+        self.db.commit()
+        return created_ids
+
+    def list_active(self) -> List[NotificationTemplate]:
+        """All active templates in id order (one query; used to build the dispatch cache)."""
+        stmt = (
+            select(NotificationTemplate)
+            .where(NotificationTemplate.is_active.is_(True))
+            .order_by(NotificationTemplate.id)
+        )
+        return list(self.db.exec(stmt).all())
+
+    def existing_name_types(self, names: Iterable[str]) -> set[Tuple[str, str]]:
+        """Return the `(name, template_type)` pairs stored for `names`, in one query."""
+        wanted = list(dict.fromkeys(names))
+        if not wanted:
+            return set()
+        stmt = select(NotificationTemplate.name, NotificationTemplate.template_type).where(
+            NotificationTemplate.name.in_(wanted)
+        )
+        return {(name, template_type) for name, template_type in self.db.exec(stmt).all()}
+
+    def create_many(self, entities: List[NotificationTemplate]) -> None:
+        """Insert all entities with one flush (batched INSERT) and one commit."""
+        if not entities:
+            return
+        self.db.add_all(entities)
+        self.db.commit()
+
+
+# pg_advisory_xact_lock id shared by all writers of service_cms_changes
+_CHANGE_LOG_LOCK_ID = 0x434D53  # "CMS"
+
+
+class ChangeLogRepository(BaseRepository[ServiceCMSChange]):
+    def __init__(self, db: Session):
+        super().__init__(db, ServiceCMSChange)
+
+    def record(self, entity_type: str, keys: Iterable[Optional[str]], action: str = "upsert") -> Dict[str, int]:
+        """Append one change per key and return key -> revision.
+
+        Only flushes (to obtain the ids); the caller's commit persists the
+        changes together with the write they describe.
+        """
+        rows = [ServiceCMSChange(entity_type=entity_type, key=key, action=action) for key in dict.fromkeys(keys) if key]
+        if not rows:
+            return {}
+        self._serialize_writers()
+        self.db.add_all(rows)
+        self.db.flush()
+        return {row.key: row.id for row in rows}
+
+    def list_since(self, since: int, *, entity_types: Sequence[str], limit: int) -> List[ServiceCMSChange]:
+        stmt = (
+            select(ServiceCMSChange)
+            .where(ServiceCMSChange.id > since, ServiceCMSChange.entity_type.in_(list(entity_types)))
+            .order_by(ServiceCMSChange.id)
+            .limit(limit)
+        )
+        return list(self.db.exec(stmt).all())
+
+    def _serialize_writers(self) -> None:
+        """Hold a transaction-scoped lock so change ids commit in id order.
+
+        Without it a lower id could commit after a reader already moved its
+        cursor past a higher one, and that change would never be delivered.
+        SQLite already serializes writers.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.exec(select(func.pg_advisory_xact_lock(_CHANGE_LOG_LOCK_ID)))
@@ -1,25 +1,48 @@
 """Admin CMS API (super_admin only)."""
 from __future__ import annotations
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
 from sqlmodel import Session
 
 from app.shared.database import get_session
 from app.auth.dependencies import require_role
 from app.users.models import ServiceUser
 
-from .service import ContentBlockService, EmailTemplateService, get_supported_variables, NotificationTemplateAdminService
+from .cache import get_cache_stats
+from .http_cache import conditional_json_response, conditional_response
+from .serialization import response_fields, rows_response
+from .service import (
+    ChangeFeedService,
+    ContentBlockService,
+    EmailTemplateService,
+    NotificationTemplateAdminService,
+    find_variable_usages,
+    get_supported_variables,
+    reindex_placeholders,
+)
+from .tours import PRODUCT_TOUR_CATEGORY
 from .schemas import (
     ContentBlockCreate,
     ContentBlockUpdate,
     ContentBlockResponse,
+    ContentBlockSummaryResponse,
     EmailTemplateCreate,
     EmailTemplateUpdate,
     EmailTemplateResponse,
+    NotificationTemplateBulkRequest,
+    NotificationTemplateBulkResponse,
+    NotificationTemplateCreate,
+    NotificationTemplateResponse,
+    NotificationTemplateSummaryResponse,
+    NotificationTemplateUpdate,
+    VariableUsagesResponse,
 )
 
 
+# Upper bound for keys accepted by the public batch lookup
+MAX_BATCH_BLOCK_KEYS = 50
+
 router = APIRouter(prefix="/admin/cms", tags=["Admin CMS"])
 public_router = APIRouter(prefix="/cms", tags=["CMS"])
 
@@ -32,6 +55,10 @@ def get_email_service(db: Session = Depends(get_session)) -> EmailTemplateServic
     return EmailTemplateService(db)
 
 
+def get_change_feed_service(db: Session = Depends(get_session)) -> ChangeFeedService:
+    return ChangeFeedService(db)
+
+
 def get_notification_admin_service(db: Session = Depends(get_session)) -> NotificationTemplateAdminService:
     return NotificationTemplateAdminService(db)
 
@@ -39,11 +66,39 @@ def get_notification_admin_service(db: Session = Depends(get_session)) -> Notifi
 @router.get("/blocks", response_model=List[ContentBlockResponse])
 def list_blocks(
     category: Optional[str] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: ContentBlockService = Depends(get_block_service),
 ):
-    items = service.list_blocks(category=category)
-    return [ContentBlockResponse.model_validate(it) for it in items]
+    """Full blocks including bodies; prefer `/blocks/summary` for tables."""
+    rows = service.list_block_rows(
+        response_fields(ContentBlockResponse), category=category, after_id=after_id, limit=limit
+    )
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return rows_response(rows, ContentBlockResponse, headers=headers)
+
+
+@router.get("/blocks/summary", response_model=List[ContentBlockSummaryResponse])
+def list_block_summaries(
+    response: Response,
+    category: Optional[str] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: return blocks with id > after_id"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    service: ContentBlockService = Depends(get_block_service),
+):
+    """Paged listing without content bodies (`content_length` instead).
+
+    Fetch the body with `GET /blocks/{id}` when editing. The next page cursor
+    is returned in `X-Next-Cursor` when the page is full.
+    """
+    rows = service.list_block_summaries(category=category, after_id=after_id, limit=limit)
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [ContentBlockSummaryResponse.model_validate(row) for row in rows]
 
 
 @router.get("/blocks/{block_id}", response_model=ContentBlockResponse)
@@ -93,7 +148,7 @@ def import_missing_blocks(
     service: ContentBlockService = Depends(get_block_service),
 ):
     items = service.import_missing_defaults()
-    return [ContentBlockResponse.model_validate(it) for it in items]
+    return rows_response(items, ContentBlockResponse)
 
 
 @router.post("/blocks/load-terms-default", response_model=ContentBlockResponse)
@@ -110,11 +165,33 @@ def list_email_templates(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
+    search_mode: Literal["name", "full"] = Query("name", description="`full` also matches subject and body, ranked"),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: return templates with id > after_id"),
+    include_total: bool = Query(False),
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: EmailTemplateService = Depends(get_email_service),
 ):
-    items, _ = service.search_templates(skip=skip, limit=limit, search=search)
-    return [EmailTemplateResponse.model_validate(it) for it in items]
+    """List templates ordered by id.
+
+    Pagination metadata goes in headers: `X-Next-Cursor` (pass back as
+    `after_id`) when the page is full, and `X-Total-Count` when `include_total`.
+    Ranked `search_mode=full` results page with `skip` instead of a cursor.
+    """
+    items, total = service.search_templates(
+        skip=skip,
+        limit=limit,
+        search=search,
+        mode=search_mode,
+        after_id=after_id,
+        include_total=include_total,
+    )
+    ranked = bool(search) and search_mode == "full"
+    headers = {}
+    if len(items) == limit and not ranked:
+        headers["X-Next-Cursor"] = str(items[-1].id)
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return rows_response(items, EmailTemplateResponse, headers=headers)
 
 
 @router.post("/email-templates", response_model=EmailTemplateResponse, status_code=status.HTTP_201_CREATED)
@@ -165,7 +242,7 @@ def import_missing_email_templates(
 ):
     """Import/Create all standard email templates if missing (idempotent)."""
     items = service.ensure_all_defaults()
-    return [EmailTemplateResponse.model_validate(it) for it in items]
+    return rows_response(items, EmailTemplateResponse)
 
 
 @router.get("/variables")
@@ -175,35 +252,131 @@ def get_variables(
     return get_supported_variables()
 
 
+@router.get("/variables/{name}/usages", response_model=VariableUsagesResponse)
+def get_variable_usages(
+    name: str,
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    db: Session = Depends(get_session),
+):
+    """Email templates and content blocks whose bodies use the `{name}` placeholder."""
+    return {"variable": name, **find_variable_usages(db, name)}
+
+
+@router.post("/variables/reindex")
+def reindex_variable_usages(
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    db: Session = Depends(get_session),
+):
+    """Recompute stored placeholders for all blocks and email templates (run once after migrating)."""
+    return reindex_placeholders(db)
+
+
+@router.get("/cache-stats")
+def get_cms_cache_stats(
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+):
+    """Per-process CMS cache counters (hits, misses, evictions, size)."""
+    return get_cache_stats()
+
+
+@router.get("/changes")
+def get_admin_changes(
+    since: int = Query(0, ge=0),
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    service: ChangeFeedService = Depends(get_change_feed_service),
+):
+    """Change feed across content blocks and email templates (see `/cms/changes`)."""
+    return service.changes_since(since, entity_types=("block", "email_template"))
+
+
 # Notification templates CRUD (admin)
-@router.get("/notification-templates")
+@router.get("/notification-templates", response_model=List[NotificationTemplateResponse])
 def list_notification_templates(
-    template_type: Optional[str] = Query(None),
+    template_type: Optional[Literal["email", "slack"]] = Query(None),
+    category: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    is_default: Optional[bool] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: return templates with id > after_id"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
+):
+    """Full templates ordered by id; prefer `/notification-templates/summary` for tables."""
+    rows = service.list_rows(
+        response_fields(NotificationTemplateResponse),
+        template_type=template_type,
+        category=category,
+        is_active=is_active,
+        is_default=is_default,
+        after_id=after_id,
+        limit=limit,
+    )
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return rows_response(rows, NotificationTemplateResponse, headers=headers)
+
+
+@router.get("/notification-templates/summary", response_model=List[NotificationTemplateSummaryResponse])
+def list_notification_template_summaries(
+    template_type: Optional[Literal["email", "slack"]] = Query(None),
     category: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    is_default: Optional[bool] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: return templates with id > after_id"),
+    limit: int = Query(100, ge=1, le=1000),
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
 ):
-    items = service.list(template_type=template_type, category=category)
-    return items
+    """Paged listing without bodies (`body_length` instead).
 
+    Fetch the body with `GET /notification-templates/{id}` when editing. The
+    next page cursor is returned in `X-Next-Cursor` when the page is full.
+    """
+    rows = service.list_summaries(
+        template_type=template_type,
+        category=category,
+        is_active=is_active,
+        is_default=is_default,
+        after_id=after_id,
+        limit=limit,
+    )
+    headers = {"X-Next-Cursor": str(rows[-1]["id"])} if len(rows) == limit else {}
+    return rows_response(rows, NotificationTemplateSummaryResponse, headers=headers)
+
+
+@router.get("/notification-templates/{template_id}", response_model=NotificationTemplateResponse)
+def get_notification_template(
+    template_id: int,
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
+):
+    return NotificationTemplateResponse.model_validate(service.get(template_id))
 
-@router.post("/notification-templates", status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "/notification-templates",
+    response_model=NotificationTemplateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
 def create_notification_template(
-    payload: dict,
+    payload: NotificationTemplateCreate,
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
 ):
-    return service.create(payload)
+    entity = service.create(payload.model_dump())
+    return NotificationTemplateResponse.model_validate(entity)
 
 
-@router.put("/notification-templates/{template_id}")
+@router.put("/notification-templates/{template_id}", response_model=NotificationTemplateResponse)
 def update_notification_template(
     template_id: int,
-    payload: dict,
+    payload: NotificationTemplateUpdate,
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
 ):
-    return service.update(template_id, payload)
+    entity = service.update(template_id, payload.model_dump(exclude_unset=True))
+    return NotificationTemplateResponse.model_validate(entity)
 
 
 @router.delete("/notification-templates/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -216,34 +389,124 @@ def delete_notification_template(
     return None
 
 
-@router.post("/notification-templates/import-missing")
+@router.post("/notification-templates/bulk", response_model=NotificationTemplateBulkResponse)
+def bulk_notification_templates(
+    payload: NotificationTemplateBulkRequest,
+    current_user: ServiceUser = Depends(require_role("super_admin")),
+    service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
+):
+    """Create, update and delete many templates in one transaction (all or nothing).
+
+    Every item is validated before anything is written; a 400 lists each
+    failing item as `{"op", "index", "detail"}`. On success, `results` holds
+    one entry per item with its id and the stored template.
+    """
+    results = service.bulk_apply(
+        create=[item.model_dump() for item in payload.create],
+        update=[item.model_dump(exclude_unset=True) for item in payload.update],
+        delete=payload.delete,
+    )
+    return NotificationTemplateBulkResponse.model_validate({"results": results}, from_attributes=True)
+
+
+@router.post("/notification-templates/import-missing", response_model=List[NotificationTemplateResponse])
 def import_missing_notification_templates(
     current_user: ServiceUser = Depends(require_role("super_admin")),
     service: NotificationTemplateAdminService = Depends(get_notification_admin_service),
 ):
     """Import default notification templates (email + slack) if missing (idempotent)."""
-    return service.import_missing_defaults()
+    return rows_response(service.import_missing_defaults(), NotificationTemplateResponse)
 
 
 # Public CMS endpoints (read-only)
 @public_router.get("/terms-of-service")
 def get_terms_of_service(
+    request: Request,
+    fmt: Literal["json", "html"] = Query("json", alias="format", description="`html` returns the pre-rendered HTML body"),
     service: ContentBlockService = Depends(get_block_service),
 ):
-    blk = service.get_by_key("terms_of_service")
-    # Auto-heal: if missing or empty, ensure default is present
-    if not blk or not str(getattr(blk, "html_content", "") or "").strip():
-        blk = service.ensure_terms_default()
-    # We store Markdown in html_content; FE renders via markdown renderer
-    return {
+    """Terms of service as JSON (`content_md` source + pre-rendered `content_html`) or as HTML.
+
+    `content_html` is sanitized HTML rendered when the block was written; it is
+    null when the Markdown renderer is not installed, in which case clients
+    render `content_md` themselves.
+    """
+    # Missing/empty blocks are healed once (single-flight) or served from seed data
+    blk = service.get_terms_of_service()
+    updated_at = getattr(blk, 'updated_at', None)
+    if fmt == "html":
+        if not blk.content_html:
+            raise HTTPException(status_code=404, detail="Rendered terms of service not available")
+        return conditional_response(
+            request,
+            blk.content_html.encode("utf-8"),
+            media_type="text/html",
+            last_modified=updated_at,
+            compressible=True,
+        )
+    payload = {
         "title": blk.title,
         "content_md": blk.html_content,
-        "updated_at": blk.updated_at.isoformat() if getattr(blk, 'updated_at', None) else None,
+        "content_html": blk.content_html,
+        "updated_at": updated_at.isoformat() if updated_at else None,
+    }
+    return conditional_json_response(request, payload, last_modified=updated_at, compressible=True)
+
+
+@public_router.get("/changes")
+def get_block_changes(
+    since: int = Query(0, ge=0, description="Last revision the client has seen"),
+    service: ChangeFeedService = Depends(get_change_feed_service),
+):
+    """Content block keys changed after revision `since`.
+
+    Returns `{"revision", "has_more", "changes": [{"type", "key", "action", "revision"}]}`;
+    pass `revision` back as `since` on the next poll. `action` is `upsert` or
+    `delete`; refetch upserted keys (e.g. via `GET /cms/blocks?keys=...`).
+    """
+    return service.changes_since(since, entity_types=("block",))
+
+
+def _public_block_payload(blk) -> dict:
+    updated_at = getattr(blk, 'updated_at', None)
+    return {
+        "key": blk.key,
+        "category": blk.category,
+        "title": blk.title,
+        "html_content": blk.html_content,
+        "updated_at": updated_at.isoformat() if updated_at else None,
     }
 
 
+@public_router.get("/blocks")
+def get_public_blocks(
+    request: Request,
+    keys: str = Query(..., description="Comma-separated block keys"),
+    category: Optional[str] = Query(None),
+    service: ContentBlockService = Depends(get_block_service),
+):
+    """Fetch several CMS content blocks in one round-trip.
+
+    Returns `{"blocks": {key: block}, "missing": [key, ...]}`; unknown keys are
+    listed in `missing` instead of failing the whole request.
+    """
+    wanted = [k.strip() for k in keys.split(",") if k.strip()]
+    if not wanted:
+        raise HTTPException(status_code=400, detail="keys is required")
+    if len(wanted) > MAX_BATCH_BLOCK_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_BLOCK_KEYS} keys per request")
+    found = service.get_many_by_keys(wanted, category=category)
+    blocks = {key: _public_block_payload(blk) for key, blk in found.items() if blk}
+    payload = {"blocks": blocks, "missing": [key for key, blk in found.items() if not blk]}
+    stamps = [blk.updated_at for blk in found.values() if blk and getattr(blk, 'updated_at', None)]
+    return conditional_json_response(
+        request, payload, last_modified=max(stamps) if stamps else None, compressible=True
+    )
+
+
 @public_router.get("/blocks/{key}")
 def get_public_block_by_key(
+    request: Request,
     key: str,
     category: Optional[str] = Query(None),
     service: ContentBlockService = Depends(get_block_service),
@@ -252,14 +515,35 @@ def get_public_block_by_key(
 
     Returns 404 if the block is not found. The payload includes the title and
     raw HTML content which the frontend renders directly in a safe container.
+    Supports conditional GETs via ETag/If-None-Match and Last-Modified; large
+    payloads are sent gzip/brotli encoded when the client accepts it.
     """
     blk = service.get_by_key(key, category=category)
     if not blk:
         raise HTTPException(status_code=404, detail="Content block not found")
-    return {
-        "key": blk.key,
-        "category": blk.category,
-        "title": blk.title,
-        "html_content": blk.html_content,
-        "updated_at": blk.updated_at.isoformat() if getattr(blk, 'updated_at', None) else None,
-    }
+    return conditional_json_response(
+        request, _public_block_payload(blk), last_modified=getattr(blk, 'updated_at', None), compressible=True
+    )
+
+
+@public_router.get("/tours/{key}")
+def get_public_tour(
+    request: Request,
+    key: str,
+    service: ContentBlockService = Depends(get_block_service),
+):
+    """Product tour as a structured Shepherd config (not a JSON string).
+
+    Serves the canonical JSON validated at write time as-is, gzip/brotli
+    encoded per Accept-Encoding, with ETag/Last-Modified revalidation.
+    """
+    blk = service.get_by_key(key, category=PRODUCT_TOUR_CATEGORY)
+    if not blk:
+        raise HTTPException(status_code=404, detail="Product tour not found")
+    return conditional_response(
+        request,
+        blk.html_content.encode("utf-8"),
+        media_type="application/json",
+        last_modified=getattr(blk, 'updated_at', None),
+        compressible=True,
+    )
@@ -1,8 +1,9 @@
 """Pydantic schemas for CMS admin DTOs."""
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic.config import ConfigDict
 from typing import Literal
 
@@ -31,8 +32,24 @@ class ContentBlockResponse(BaseModel):
     category: str
     title: str
     html_content: str
+    content_html: Optional[str] = None
     description: Optional[str] = None
     variables: List[str] = []
+    placeholders: List[str] = []
+    revision: int = 0
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ContentBlockSummaryResponse(BaseModel):
+    id: int
+    key: str
+    category: str
+    title: str
+    description: Optional[str] = None
+    variables: List[str] = []
+    updated_at: Optional[datetime] = None
+    revision: int = 0
+    content_length: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -61,28 +78,54 @@ class EmailTemplateResponse(BaseModel):
     subject_template: str
     body_html: str
     variables: List[str] = []
+    placeholders: List[str] = []
     is_active: bool
+    revision: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
+class EmailTemplateUsage(BaseModel):
+    id: int
+    name: str
+    category: str
+
+
+class ContentBlockUsage(BaseModel):
+    id: int
+    key: str
+    category: str
+
+
+class VariableUsagesResponse(BaseModel):
+    variable: str
+    email_templates: List[EmailTemplateUsage] = []
+    blocks: List[ContentBlockUsage] = []
+
+
 # Notification Templates (wrapping app.notifications.models.NotificationTemplate)
 class NotificationTemplateCreate(BaseModel):
-    name: str
+    name: str = Field(..., min_length=1)
     template_type: Literal['email', 'slack']
-    category: str
+    category: str = Field(..., min_length=1)
     subject_template: Optional[str] = None
-    body_template: str
+    body_template: str = Field(..., min_length=1)
     variables: List[str] = Field(default_factory=list)
     is_active: bool = True
     is_default: bool = False
 
+    @model_validator(mode="after")
+    def _email_needs_subject(self) -> "NotificationTemplateCreate":
+        if self.template_type == 'email' and not self.subject_template:
+            raise ValueError("Email templates must have a subject_template")
+        return self
+
 
 class NotificationTemplateUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[str] = Field(None, min_length=1)
     template_type: Optional[Literal['email', 'slack']] = None
-    category: Optional[str] = None
+    category: Optional[str] = Field(None, min_length=1)
     subject_template: Optional[str] = None
-    body_template: Optional[str] = None
+    body_template: Optional[str] = Field(None, min_length=1)
     variables: Optional[List[str]] = None
     is_active: Optional[bool] = None
     is_default: Optional[bool] = None
@@ -99,3 +142,49 @@ class NotificationTemplateResponse(BaseModel):
     is_active: bool
     is_default: bool
     model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationTemplateSummaryResponse(BaseModel):
+    id: int
+    name: str
+    template_type: str
+    category: str
+    subject_template: Optional[str] = None
+    variables: List[str] = []
+    is_active: bool
+    is_default: bool
+    body_length: int = 0
+
+
+# Upper bound for items (create + update + delete) in one bulk request
+MAX_NOTIFICATION_TEMPLATE_BULK_ITEMS = 500
+
+
+class NotificationTemplateBulkUpdateItem(NotificationTemplateUpdate):
+    id: int
+
+
+class NotificationTemplateBulkRequest(BaseModel):
+    create: List[NotificationTemplateCreate] = Field(default_factory=list)
+    update: List[NotificationTemplateBulkUpdateItem] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _check_size(self) -> "NotificationTemplateBulkRequest":
+        total = len(self.create) + len(self.update) + len(self.delete)
+        if total == 0:
+            raise ValueError("at least one create, update or delete item is required")
+        if total > MAX_NOTIFICATION_TEMPLATE_BULK_ITEMS:
+            raise ValueError(f"at most {MAX_NOTIFICATION_TEMPLATE_BULK_ITEMS} items per request")
+        return self
+
+
+class NotificationTemplateBulkItemResult(BaseModel):
+    op: Literal['create', 'update', 'delete']
+    index: int  # position within the request's list for `op`
+    id: int
+    template: Optional[NotificationTemplateResponse] = None
+
+
+class NotificationTemplateBulkResponse(BaseModel):
+    results: List[NotificationTemplateBulkItemResult]
@@ -1,20 +1,47 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 
 _TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 
+# Nothing is read at import time. Files are read on first use and re-read only
+# when their (mtime_ns, size) signature changes, so edited seeds are picked up
+# without a restart.
+_Signature = Optional[tuple[int, int]]
+
+_lock = threading.RLock()
+_file_cache: dict[Path, tuple[_Signature, Optional[str]]] = {}
+_derived_cache: dict[str, tuple[dict[Path, _Signature], Any]] = {}
+# Files read while building a derived value (see `_memoized`)
+_tracked: Optional[dict[Path, _Signature]] = None
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 
 def _read_text(rel_path: str) -> Optional[str]:
     path = (_TEMPLATES_DIR / rel_path).resolve()
-    if not path.exists():
-        return None
-    content = path.read_text(encoding="utf-8")
-    content = content.strip()
-    return content or None
+    with _lock:
+        sig = _signature(path)
+        if _tracked is not None:
+            _tracked[path] = sig
+        cached = _file_cache.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        content = None
+        if sig is not None:
+            content = path.read_text(encoding="utf-8").strip() or None
+        _file_cache[path] = (sig, content)
+        return content
 
 
 def _read_json(rel_path: str) -> Any:
@@ -24,6 +51,23 @@ def _read_json(rel_path: str) -> Any:
     return json.loads(content)
 
 
+def _memoized(name: str, build: Callable[[], Any]) -> Any:
+    """Return the cached result of `build` while none of the files it read changed."""
+    global _tracked
+    with _lock:
+        cached = _derived_cache.get(name)
+        if cached is not None and all(_signature(p) == sig for p, sig in cached[0].items()):
+            return cached[1]
+        previous, _tracked = _tracked, {}
+        try:
+            value = build()
+            deps = _tracked
+        finally:
+            _tracked = previous
+        _derived_cache[name] = (deps, value)
+        return value
+
+
 def load_default_content_blocks() -> list[dict[str, Any]]:
     """Load default CMS content blocks from disk."""
     meta = _read_json("content_blocks/defaults.json")
@@ -53,7 +97,9 @@ def load_default_content_blocks() -> list[dict[str, Any]]:
     return [b for b in out if b["key"] and b["title"]]
 
 
-DEFAULT_CONTENT_BLOCKS: list[dict[str, Any]] = load_default_content_blocks()
+def default_content_blocks() -> list[dict[str, Any]]:
+    """Cached default content blocks; the returned list is shared, do not mutate it."""
+    return _memoized("content_blocks", load_default_content_blocks)
 
 
 def render_email_html(rel_path: str, *, style: str) -> Optional[str]:
@@ -72,5 +118,15 @@ def load_default_notification_templates() -> list[dict[str, Any]]:
     return [d for d in data if isinstance(d, dict)]
 
 
-DEFAULT_NOTIFICATION_TEMPLATES: list[dict[str, Any]] = load_default_notification_templates()
+def default_notification_templates() -> list[dict[str, Any]]:
+    """Cached notification template defaults; the returned list is shared, do not mutate it."""
+    return _memoized("notification_templates", load_default_notification_templates)
+
 
+def __getattr__(name: str) -> Any:
+    # Backwards-compatible lazy aliases for the former import-time constants
+    if name == "DEFAULT_CONTENT_BLOCKS":
+        return default_content_blocks()
+    if name == "DEFAULT_NOTIFICATION_TEMPLATES":
+        return default_notification_templates()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
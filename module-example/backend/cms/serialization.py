@@ -0,0 +1,89 @@
+"""Fast-path JSON responses for bulk CMS admin endpoints.
+
+List/import endpoints can return hundreds of rows with large bodies. Building
+a Pydantic model per row (`model_validate(..., from_attributes=True)`) and
+then letting FastAPI validate the list again against `response_model` costs
+more than the query itself. Instead, rows are projected onto the response
+schema's field names and encoded once. `response_model` stays on the routes
+for the OpenAPI schema; FastAPI skips it because a `Response` is returned.
+
+Only use this for rows whose values are already JSON-native (plus datetimes),
+i.e. data that was validated when it was written.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+try:  # optional, ~5x faster encoding of large bodies
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def response_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names of a response schema, in declaration order."""
+    return tuple(schema.model_fields)
+
+
+@lru_cache(maxsize=None)
+def response_defaults(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Non-None defaults of a response schema's optional fields (e.g. `[]`, `0`)."""
+    defaults = {}
+    for name, field in schema.model_fields.items():
+        if not field.is_required():
+            default = field.get_default(call_default_factory=True)
+            if default is not None:
+                defaults[name] = default
+    return defaults
+
+
+def project(item: Any, fields: Tuple[str, ...], defaults: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Pick `fields` from an ORM entity, a SQLAlchemy row mapping or a dict.
+
+    Missing or NULL values fall back to `defaults` (see `response_defaults`),
+    as `model_validate` would for a missing key.
+    """
+    if isinstance(item, Mapping):
+        row = {field: item.get(field) for field in fields}
+    else:
+        row = {field: getattr(item, field, None) for field in fields}
+    for field, default in (defaults or {}).items():
+        if row.get(field, default) is None:
+            row[field] = default
+    return row
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_rows(rows: List[Dict[str, Any]]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rows, default=_default)
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def rows_response(
+    items: Iterable[Any],
+    schema: Type[BaseModel],
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """Encode `items` as a JSON list shaped like `List[schema]` without per-row validation.
+
+    Headers must be passed here: headers set on an injected `Response`
+    parameter are not applied when an endpoint returns its own Response.
+    """
+    fields = response_fields(schema)
+    defaults = response_defaults(schema)
+    body = encode_rows([project(item, fields, defaults) for item in items])
+    return Response(content=body, media_type="application/json", headers=headers, status_code=status_code)
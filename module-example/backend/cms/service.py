@@ -1,24 +1,115 @@
 """Services for CMS content blocks and email templates."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from app.core.crud_base import BaseService
 from .models import ServiceContentBlock, ServiceEmailTemplate
-from .repository import ContentBlockRepository, EmailTemplateRepository
-from .seeds.loader import DEFAULT_CONTENT_BLOCKS, DEFAULT_NOTIFICATION_TEMPLATES, render_email_html
+from .repository import (
+    ChangeLogRepository,
+    ContentBlockRepository,
+    EmailTemplateRepository,
+    NotificationTemplateRepository,
+)
+from .cache import SingleFlight, invalidate_block_keys, public_block_cache
+from .invalidation import publish_invalidation
+from .markup import render_markdown
+from .notification_cache import invalidate_notification_templates
+from .tours import PRODUCT_TOUR_CATEGORY, TourValidationError, canonicalize_tour
+from .rendering import MemoizedEmailTemplates, extract_placeholders, get_compiled, render_batch
+from .seeds.loader import default_content_blocks, default_notification_templates, render_email_html
 from app.notifications.repository import NotificationRepository
 from app.notifications.models import NotificationTemplate
 
 
-class ContentBlockService(BaseService[ServiceContentBlock]):
+def stores_seeded_values(entity: Any, seeded: Dict[str, Any]) -> bool:
+    """True when `entity` already stores exactly the `seeded` field values."""
+    return all(getattr(entity, field) == value for field, value in seeded.items())
+
+
+# Fields of a content block owned by seed data (ensure_* overwrites only these)
+_SEEDED_BLOCK_FIELDS = ("category", "title", "html_content", "description", "variables", "placeholders")
+
+
+def checked_placeholders(variables: Optional[Iterable[str]], *sources: Optional[str]) -> List[str]:
+    """Placeholders used in `sources`; 400 if any is not a declared variable."""
+    found = extract_placeholders(*sources)
+    unknown = sorted(set(found).difference(variables or ()))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown template variables: {', '.join(unknown)} (add them to variables)",
+        )
+    return found
+
+
+TERMS_KEY = "terms_of_service"
+# Blocks whose html_content holds Markdown; their sanitized HTML is rendered on write into content_html
+MARKDOWN_BLOCK_KEYS = frozenset({TERMS_KEY})
+# How long concurrent readers wait for the in-flight ToS heal before serving the seed fallback
+TERMS_HEAL_WAIT_SECONDS = 2.0
+
+_terms_heal_flight = SingleFlight()
+
+
+# (seed list the fallback was built from, detached block)
+_terms_fallback: Tuple[Any, Optional[ServiceContentBlock]] = (None, None)
+
+
+def _terms_fallback_block() -> Optional[ServiceContentBlock]:
+    """Detached ToS block built from seed data, served when the DB copy is unusable.
+
+    Rebuilt only when the seed loader hands out a new list (seed file edited).
+    """
+    global _terms_fallback
+    seeds = default_content_blocks()
+    if _terms_fallback[0] is not seeds:
+        data = next((d for d in seeds if d["key"] == TERMS_KEY), None)
+        blk = None
+        if data:
+            blk = ServiceContentBlock(**data, content_html=render_markdown(data["html_content"]))
+        _terms_fallback = (seeds, blk)
+    return _terms_fallback[1]
+
+
+class _ChangeTrackingMixin:
+    """Shared write bookkeeping for services whose content feeds caches."""
+
+    change_type: str
+    db: Session
+    changes: ChangeLogRepository
+
+    def _record_changes(self, keys: List[str], action: str = "upsert") -> Dict[str, int]:
+        """Log a revision per key and announce the keys on the invalidation bus.
+
+        Called before the write commits, so Postgres NOTIFY fires only on commit.
+        """
+        revisions = self.changes.record(self.change_type, keys, action)
+        publish_invalidation(self.db, self.change_type, list(revisions))
+        return revisions
+
+    def _record_upsert(self, key: str, previous_key: Optional[str] = None) -> int:
+        """Revision for a validated create/update of `key` (a rename also logs a delete of `previous_key`).
+
+        Called at the end of validate_create/validate_update, so rejected
+        writes never append to the change log.
+        """
+        if previous_key and previous_key != key:
+            self._record_changes([previous_key], "delete")
+        return self._record_changes([key]).get(key, 0)
+
+
+class ContentBlockService(_ChangeTrackingMixin, BaseService[ServiceContentBlock]):
     model = ServiceContentBlock
     repo_class = ContentBlockRepository
+    change_type = "block"
 
     def __init__(self, db: Session):
         super().__init__(db)
+        self.changes = ChangeLogRepository(db)
 
     @staticmethod
     def _normalize_category(raw: Optional[str]) -> str:
@@ -36,8 +127,12 @@ class ContentBlockService(BaseService[ServiceContentBlock]):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="title is required")
         if not html:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="html_content is required")
+        if data["category"] == PRODUCT_TOUR_CATEGORY:
+            data["html_content"] = self._canonical_tour(html)
+        data["placeholders"] = self._block_placeholders(data["category"], data["html_content"], data.get("variables"))
         if self.repo.get_by_key(key):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Block '{key}' already exists")
+        data["revision"] = self._record_upsert(data["key"])
 
     def validate_update(self, entity: ServiceContentBlock, updates: Dict[str, Any]) -> None:
         if "key" in updates and updates["key"] is not None:
@@ -52,50 +147,259 @@ class ContentBlockService(BaseService[ServiceContentBlock]):
         if "html_content" in updates and updates["html_content"] is not None:
             if not str(updates["html_content"]).strip():
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="html_content cannot be empty")
+        category = updates.get("category") or entity.category
+        if category == PRODUCT_TOUR_CATEGORY and (updates.get("html_content") is not None or category != entity.category):
+            updates["html_content"] = self._canonical_tour(updates.get("html_content") or entity.html_content)
+        if any(updates.get(field) is not None for field in ("category", "html_content", "variables")):
+            updates["placeholders"] = self._block_placeholders(
+                category,
+                updates.get("html_content") or entity.html_content,
+                updates["variables"] if updates.get("variables") is not None else entity.variables,
+            )
+        updates["revision"] = self._record_upsert(updates.get("key") or entity.key, entity.key)
+
+    @staticmethod
+    def _block_placeholders(category: str, html: str, variables: Optional[List[str]]) -> List[str]:
+        # Tours are JSON config, not templates
+        if category == PRODUCT_TOUR_CATEGORY:
+            return []
+        return checked_placeholders(variables, html)
+
+    @staticmethod
+    def _canonical_tour(raw: str) -> str:
+        try:
+            return canonicalize_tour(raw)
+        except TourValidationError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid product tour: {exc}")
 
-    def list_blocks(self, *, category: Optional[str] = None) -> List[ServiceContentBlock]:
-        return self.repo.list_all(category=category)
+    @staticmethod
+    def _content_html(key: Optional[str], html_content: Optional[str]) -> Optional[str]:
+        return render_markdown(html_content) if key in MARKDOWN_BLOCK_KEYS else None
+
+    def create(self, data: Dict[str, Any]) -> ServiceContentBlock:
+        data["content_html"] = self._content_html(data.get("key"), data.get("html_content"))
+        entity = super().create(data)
+        invalidate_block_keys(entity.key)
+        return entity
+
+    def update(self, entity_id: int, updates: Dict[str, Any]) -> ServiceContentBlock:
+        current = self.get(entity_id)
+        old_key = current.key
+        new_key = updates.get("key") or old_key
+        if new_key != old_key or updates.get("html_content") is not None:
+            updates["content_html"] = self._content_html(new_key, updates.get("html_content") or current.html_content)
+        entity = super().update(entity_id, updates)
+        invalidate_block_keys(old_key, entity.key)
+        return entity
+
+    def delete(self, entity_id: int) -> None:
+        key = self.get(entity_id).key
+        self._record_changes([key], "delete")
+        super().delete(entity_id)
+        invalidate_block_keys(key)
+
+    def list_blocks(
+        self,
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[ServiceContentBlock]:
+        return self.repo.list_all(category=category, after_id=after_id, limit=limit)
+
+    def list_block_rows(
+        self,
+        columns: Sequence[str],
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Selected columns as plain dicts, for responses serialized without ORM objects."""
+        return self.repo.list_rows(columns, category=category, after_id=after_id, limit=limit)
+
+    def list_block_summaries(
+        self,
+        *,
+        category: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Any]:
+        """Lightweight rows for admin tables; load bodies with `get(id)` on demand."""
+        return self.repo.list_summaries(category=category, after_id=after_id, limit=limit)
 
     def get_by_key(self, key: str, *, category: Optional[str] = None) -> Optional[ServiceContentBlock]:
-        return self.repo.get_by_key(key, category=category)
+        """Read-through cached lookup by key (and optional category).
+
+        Returns a detached copy that is shared between requests; callers must
+        not mutate or persist it. Use `self.repo.get_by_key` for writes.
+        """
+        def _load() -> Optional[ServiceContentBlock]:
+            blk = self.repo.get_by_key(key, category=category)
+            return ServiceContentBlock(**blk.model_dump()) if blk else None
+
+        return public_block_cache.get_or_load((key, category or None), _load)
+
+    def get_many_by_keys(self, keys: List[str], *, category: Optional[str] = None) -> Dict[str, Optional[ServiceContentBlock]]:
+        """Cached batch lookup; cache misses are resolved with one repository query.
+
+        Returns a map for every requested key, with `None` for unknown keys.
+        Values are shared detached copies, as with `get_by_key`.
+        """
+        category = category or None
+        out: Dict[str, Optional[ServiceContentBlock]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            try:
+                out[key] = public_block_cache.get((key, category))
+            except KeyError:
+                missing.append(key)
+        if missing:
+            generation = public_block_cache.generation
+            found = self.repo.get_many_by_keys(missing, category=category)
+            for key in missing:
+                blk = found.get(key)
+                copy = ServiceContentBlock(**blk.model_dump()) if blk else None
+                public_block_cache.set((key, category), copy, generation=generation)
+                out[key] = copy
+        return out
+
+    def get_terms_of_service(self) -> ServiceContentBlock:
+        """Return the ToS block for public reads, healing it at most once per process.
+
+        When the stored block is missing or empty, one request re-seeds it while
+        concurrent requests wait briefly for that result. If the heal is slow or
+        fails, readers get the precomputed seed copy instead of writing themselves.
+        """
+        blk = self.get_by_key(TERMS_KEY)
+        if blk and str(blk.html_content or "").strip():
+            return blk
+        try:
+            return _terms_heal_flight.do(TERMS_KEY, self._heal_terms, timeout=TERMS_HEAL_WAIT_SECONDS)
+        except (TimeoutError, SQLAlchemyError):
+            fallback = _terms_fallback_block()
+            if fallback is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Terms of service not found")
+            return fallback
+
+    def _heal_terms(self) -> ServiceContentBlock:
+        # The miss may come from a stale cache entry: never overwrite a ToS the DB
+        # already holds (e.g. an admin edit made on another worker) with the seed
+        try:
+            entity = self.repo.get_by_key(TERMS_KEY)
+            if entity and str(entity.html_content or "").strip():
+                invalidate_block_keys(TERMS_KEY)
+            else:
+                entity = self.ensure_terms_default()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        # Shared with follower requests on other sessions, so hand out a detached copy
+        return ServiceContentBlock(**entity.model_dump())
 
     # --- Defaults seeding for content blocks ---
     def _default_blocks(self) -> List[ServiceContentBlock]:
-        if not DEFAULT_CONTENT_BLOCKS:
+        seeds = default_content_blocks()
+        if not seeds:
             raise RuntimeError("CMS seed content blocks missing (cms/seeds/templates/content_blocks/defaults.json)")
-        return [ServiceContentBlock(**data) for data in DEFAULT_CONTENT_BLOCKS]
+        blocks = [ServiceContentBlock(**data) for data in seeds]
+        for blk in blocks:
+            if blk.category == PRODUCT_TOUR_CATEGORY:
+                blk.html_content = canonicalize_tour(blk.html_content)
+            else:
+                # Seeds are trusted: record what they use without rejecting undeclared names
+                blk.placeholders = extract_placeholders(blk.html_content)
+        return blocks
 
     def import_missing_defaults(self) -> List[ServiceContentBlock]:
-        """Create default content blocks if missing (idempotent)."""
-        created: List[ServiceContentBlock] = []
-        for default in self._default_blocks():
-            existing = self.repo.get_by_key(default.key)
-            if not existing:
-                created.append(self.repo.create(default))
-        return created
+        """Create default content blocks if missing (idempotent).
+
+        One query finds the existing keys, one batched insert adds the rest.
+        """
+        defaults = self._default_blocks()
+        existing = self.repo.existing_keys(blk.key for blk in defaults)
+        missing = [blk for blk in defaults if blk.key not in existing]
+        if not missing:
+            return []
+        revisions = self._record_changes([blk.key for blk in missing])
+        for blk in missing:
+            blk.revision = revisions[blk.key]
+            blk.content_html = self._content_html(blk.key, blk.html_content)
+        self.repo.create_many(missing)
+        keys = [blk.key for blk in missing]
+        invalidate_block_keys(*keys)
+        created = self.repo.get_many_by_keys(keys)
+        return [created[key] for key in keys if key in created]
 
     def ensure_terms_default(self) -> ServiceContentBlock:
-        """Create or update the ToS content block with default Markdown."""
+        """Create or update the ToS content block with default Markdown.
+
+        No write happens when the stored block already matches the seed.
+        """
         defaults = {blk.key: blk for blk in self._default_blocks()}
-        tos = defaults["terms_of_service"]
-        existing = self.repo.get_by_key("terms_of_service")
+        tos = defaults[TERMS_KEY]
+        tos.content_html = self._content_html(TERMS_KEY, tos.html_content)
+        existing = self.repo.get_by_key(TERMS_KEY)
         if existing:
-            existing.category = tos.category
-            existing.title = tos.title
-            existing.html_content = tos.html_content
-            existing.description = tos.description
-            existing.variables = tos.variables
-            return self.repo.update(existing)
+            seeded = {field: getattr(tos, field) for field in (*_SEEDED_BLOCK_FIELDS, "content_html")}
+            if stores_seeded_values(existing, seeded):
+                # Unchanged seed: skip the write so updated_at, caches and ETags stay valid
+                return existing
+            for field, value in seeded.items():
+                setattr(existing, field, value)
+            existing.revision = self._record_changes([TERMS_KEY])[TERMS_KEY]
+            entity = self.repo.update(existing)
         else:
-            return self.repo.create(tos)
+            tos.revision = self._record_changes([TERMS_KEY])[TERMS_KEY]
+            entity = self.repo.create(tos)
+        invalidate_block_keys(entity.key)
+        return entity
 
 
-class EmailTemplateService(BaseService[ServiceEmailTemplate]):
+_INVITATION_VARIABLES = (
+    "user_name",
+    "inviter_name",
+    "tenant_name",
+    "accept_url",
+    "temporary_password",
+    "email",
+)
+_DIGEST_VARIABLES = (
+    "user_name",
+    "count",
+    "assignments",
+    "app_url",
+    "assignments_html",
+    "smart_signals",
+    "smart_signals_total_open",
+    "smart_signals_section_html",
+)
+_PASSWORD_RESET_VARIABLES = ("user_name", "reset_url")
+_USAGE_ALERT_VARIABLES = (
+    "tenant_name",
+    "usage_type",
+    "percentage",
+    "current_usage",
+    "limit",
+    "remaining",
+    "app_url",
+)
+_DAILY_DIGEST_SUBJECT = "Queast digest — {count} new opportunities"
+_WEEKLY_DIGEST_SUBJECT = "Your Weekly Jobs Digest - {count} new opportunities"
+
+
+class EmailTemplateService(_ChangeTrackingMixin, BaseService[ServiceEmailTemplate]):
     model = ServiceEmailTemplate
     repo_class = EmailTemplateRepository
+    change_type = "email_template"
 
     def __init__(self, db: Session):
         super().__init__(db)
+        self.changes = ChangeLogRepository(db)
+
+    def delete(self, entity_id: int) -> None:
+        self._record_changes([self.get(entity_id).name], "delete")
+        super().delete(entity_id)
 
     def validate_create(self, data: Dict[str, Any]) -> None:
         name = (data.get("name") or "").strip()
@@ -110,8 +414,10 @@ class EmailTemplateService(BaseService[ServiceEmailTemplate]):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="subject_template is required")
         if not body_html:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="body_html is required")
+        data["placeholders"] = checked_placeholders(data.get("variables"), data["subject_template"], data["body_html"])
         if self.repo.get_by_name(name):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Template '{name}' already exists")
+        data["revision"] = self._record_upsert(data["name"])
 
     def validate_update(self, entity: ServiceEmailTemplate, updates: Dict[str, Any]) -> None:
         if "name" in updates and updates["name"] is not None:
@@ -127,62 +433,160 @@ class EmailTemplateService(BaseService[ServiceEmailTemplate]):
         if "body_html" in updates and updates["body_html"] is not None:
             if not str(updates["body_html"]).strip():
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="body_html cannot be empty")
+        if any(updates.get(field) is not None for field in ("subject_template", "body_html", "variables")):
+            updates["placeholders"] = checked_placeholders(
+                updates["variables"] if updates.get("variables") is not None else entity.variables,
+                updates.get("subject_template") or entity.subject_template,
+                updates.get("body_html") or entity.body_html,
+            )
+        updates["revision"] = self._record_upsert(updates.get("name") or entity.name, entity.name)
+
+    def search_templates(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        mode: str = "name",
+        after_id: Optional[int] = None,
+        include_total: bool = False,
+    ) -> Tuple[List[ServiceEmailTemplate], Optional[int]]:
+        return self.repo.search(
+            skip=skip, limit=limit, search=search, mode=mode, after_id=after_id, include_total=include_total
+        )
+
+    def get_active_by_name(self, name: str) -> ServiceEmailTemplate:
+        entity = self.repo.get_by_name(name)
+        if not entity or not entity.is_active:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Template '{name}' not found")
+        return entity
 
-    def search_templates(self, *, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> Tuple[List[ServiceEmailTemplate], int]:
-        return self.repo.search(skip=skip, limit=limit, search=search)
+    @staticmethod
+    def render(template: ServiceEmailTemplate, context: Dict[str, Any]) -> Tuple[str, str]:
+        """Render `(subject, html)` from precompiled forms of the template.
 
-    def ensure_invitation_default(self) -> ServiceEmailTemplate:
-        """Create or update a sensible default invitation email template from built-ins.
+        Only placeholders listed in `template.variables` are substituted, and
+        each of them must be present in `context` (TemplateRenderError otherwise).
+        """
+        subject = get_compiled(template, "subject_template").render(context)
+        html = get_compiled(template, "body_html").render(context)
+        return subject, html
 
-        Uses EmailTemplates to generate an HTML with placeholder tokens, not concrete values.
+    @staticmethod
+    def render_many(
+        template: ServiceEmailTemplate,
+        contexts: Iterable[Dict[str, Any]],
+        *,
+        shared: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """Stream `(subject, html)` for each recipient context (e.g. digest sends).
+
+        `shared` holds values identical for every recipient (app_url, header,
+        footer); they are substituted once up front. Per-recipient contexts only
+        need the remaining variables. Large batches are rendered on the shared
+        process pool; `workers` caps how many chunks this batch keeps in flight
+        there, not the pool size (see `rendering.render_batch`).
         """
-        from app.email.templates import EmailTemplates  # local import to avoid cycles
-
-        existing = self.repo.get_by_name("invitation")
-
-        # Build placeholder context to keep tokens in place after replacement
-        placeholder_ctx = {
-            "user_name": "{user_name}",
-            "inviter_name": "{inviter_name}",
-            "tenant_name": "{tenant_name}",
-            "accept_url": "{accept_url}",
-            "temporary_password": "{temporary_password}",
-            "email": "{email}",
+        shared = shared or {}
+        subject = get_compiled(template, "subject_template").partial(shared)
+        body = get_compiled(template, "body_html").partial(shared)
+        return render_batch(subject, body, contexts, workers=workers)
+
+    # --- Defaults seeding for email templates ---
+    def _templates(self) -> MemoizedEmailTemplates:
+        # Placeholder renders are memoized process-wide, so repeated imports
+        # across tenants do not re-render identical built-in HTML
+        return MemoizedEmailTemplates(self.db)
+
+    @staticmethod
+    def _invitation_spec(templates) -> Dict[str, Any]:
+        # Placeholder context keeps tokens in place after replacement
+        html = templates.render_invitation({v: "{" + v + "}" for v in _INVITATION_VARIABLES})
+        return {
+            "name": "invitation",
+            "category": "invitation",
+            "subject_template": "Welcome to Queast — invited by {inviter_name}",
+            "body_html": html,
+            "variables": list(_INVITATION_VARIABLES),
+        }
+
+    @staticmethod
+    def _digest_spec(templates, name: str, subject: str) -> Dict[str, Any]:
+        seed_path = f"email_templates/{name}.html"
+        html = render_email_html(seed_path, style=templates.notification_style)
+        if not html:
+            raise RuntimeError(f"CMS seed email template missing (cms/seeds/templates/{seed_path})")
+        return {
+            "name": name,
+            "category": name,
+            "subject_template": subject,
+            "body_html": html,
+            "variables": list(_DIGEST_VARIABLES),
+        }
+
+    @staticmethod
+    def _password_reset_spec(templates) -> Dict[str, Any]:
+        html = templates.render_password_reset({v: "{" + v + "}" for v in _PASSWORD_RESET_VARIABLES})
+        return {
+            "name": "password_reset",
+            "category": "password_reset",
+            "subject_template": "Password Reset Request - Queast",
+            "body_html": html,
+            "variables": list(_PASSWORD_RESET_VARIABLES),
         }
-        html = EmailTemplates(self.db).render_invitation(placeholder_ctx)
 
-        subject = "Welcome to Queast — invited by {inviter_name}"
+    @staticmethod
+    def _usage_alert_spec(templates) -> Dict[str, Any]:
+        html = templates.render_usage_alert({v: "{" + v + "}" for v in _USAGE_ALERT_VARIABLES})
+        return {
+            "name": "usage_alert",
+            "category": "usage_alert",
+            "subject_template": "Usage Alert: {usage_type} at {percentage}% of limit",
+            "body_html": html,
+            "variables": list(_USAGE_ALERT_VARIABLES),
+        }
 
+    @staticmethod
+    def _with_placeholders(spec: Dict[str, Any]) -> Dict[str, Any]:
+        # Built-in bodies are trusted: record their placeholders without rejecting any
+        return {**spec, "placeholders": extract_placeholders(spec["subject_template"], spec["body_html"])}
+
+    def _default_specs(self) -> List[Dict[str, Any]]:
+        templates = self._templates()
+        specs = [
+            self._invitation_spec(templates),
+            self._digest_spec(templates, "daily_digest", _DAILY_DIGEST_SUBJECT),
+            self._digest_spec(templates, "weekly_digest", _WEEKLY_DIGEST_SUBJECT),
+            self._password_reset_spec(templates),
+            self._usage_alert_spec(templates),
+        ]
+        return [self._with_placeholders(spec) for spec in specs]
+
+    def _ensure_default(self, name: str) -> ServiceEmailTemplate:
+        """Create the default template `name`, or overwrite the seeded fields of an existing one.
+
+        Existing templates whose seeded fields already match the spec are returned
+        without a write (so `updated_at` and downstream caches stay untouched).
+        """
+        spec = next(spec for spec in self._default_specs() if spec["name"] == name)
+        existing = self.repo.get_by_name(spec["name"])
         if existing:
-            existing.category = "invitation"
-            existing.subject_template = subject
-            existing.body_html = html
-            existing.variables = [
-                "user_name",
-                "inviter_name",
-                "tenant_name",
-                "accept_url",
-                "temporary_password",
-                "email",
-            ]
+            if stores_seeded_values(existing, spec):
+                return existing
+            for field, value in spec.items():
+                setattr(existing, field, value)
+            existing.revision = self._record_changes([spec["name"]])[spec["name"]]
             return self.repo.update(existing)
-        else:
-            entity = ServiceEmailTemplate(
-                name="invitation",
-                category="invitation",
-                subject_template=subject,
-                body_html=html,
-                variables=[
-                    "user_name",
-                    "inviter_name",
-                    "tenant_name",
-                    "accept_url",
-                    "temporary_password",
-                    "email",
-                ],
-                is_active=True,
-            )
-            return self.repo.create(entity)
+        revision = self._record_changes([spec["name"]])[spec["name"]]
+        return self.repo.create(ServiceEmailTemplate(**spec, is_active=True, revision=revision))
+
+    def ensure_invitation_default(self) -> ServiceEmailTemplate:
+        """Create or update a sensible default invitation email template from built-ins.
+
+        Uses EmailTemplates to generate an HTML with placeholder tokens, not concrete values.
+        """
+        return self._ensure_default("invitation")
 
     def ensure_daily_digest_default(self) -> ServiceEmailTemplate:
         """Create or update default daily digest email template.
@@ -191,51 +595,7 @@ class EmailTemplateService(BaseService[ServiceEmailTemplate]):
         rendered email always reflects the current simplified list markup from
         EmailTemplates._augment_digest_context().
         """
-        from app.email.templates import EmailTemplates  # local import to avoid cycles
-
-        existing = self.repo.get_by_name("daily_digest")
-
-        style = EmailTemplates(self.db).notification_style
-        html = render_email_html("email_templates/daily_digest.html", style=style)
-        if not html:
-            raise RuntimeError("CMS seed email template missing (cms/seeds/templates/email_templates/daily_digest.html)")
-
-        subject = "Queast digest — {count} new opportunities"
-
-        if existing:
-            existing.category = "daily_digest"
-            existing.subject_template = subject
-            existing.body_html = html
-            existing.variables = [
-                "user_name",
-                "count",
-                "assignments",
-                "app_url",
-                "assignments_html",
-                "smart_signals",
-                "smart_signals_total_open",
-                "smart_signals_section_html",
-            ]
-            return self.repo.update(existing)
-        else:
-            entity = ServiceEmailTemplate(
-                name="daily_digest",
-                category="daily_digest",
-                subject_template=subject,
-                body_html=html,
-                variables=[
-                    "user_name",
-                    "count",
-                    "assignments",
-                    "app_url",
-                    "assignments_html",
-                    "smart_signals",
-                    "smart_signals_total_open",
-                    "smart_signals_section_html",
-                ],
-                is_active=True,
-            )
-            return self.repo.create(entity)
+        return self._ensure_default("daily_digest")
 
     def ensure_weekly_digest_default(self) -> ServiceEmailTemplate:
         """Create or update default weekly digest email template from built-ins.
@@ -243,151 +603,70 @@ class EmailTemplateService(BaseService[ServiceEmailTemplate]):
         Uses the daily digest renderer for initial content; admins can customize
         via CMS. Subject reflects weekly period.
         """
-        from app.email.templates import EmailTemplates  # local import to avoid cycles
+        return self._ensure_default("weekly_digest")
 
-        existing = self.repo.get_by_name("weekly_digest")
+    def ensure_password_reset_default(self) -> ServiceEmailTemplate:
+        """Create or update default password reset email template from built-ins."""
+        return self._ensure_default("password_reset")
 
-        templates = EmailTemplates(self.db)
-        style = templates.notification_style
-        html = render_email_html("email_templates/weekly_digest.html", style=style)
-        if not html:
-            raise RuntimeError("CMS seed email template missing (cms/seeds/templates/email_templates/weekly_digest.html)")
+    def ensure_usage_alert_default(self) -> ServiceEmailTemplate:
+        """Create or update default usage alert email template from built-ins."""
+        return self._ensure_default("usage_alert")
 
-        subject = "Your Weekly Jobs Digest - {count} new opportunities"
+    def ensure_all_defaults(self) -> List[ServiceEmailTemplate]:
+        """Ensure all standard email templates exist (idempotent).
 
-        if existing:
-            existing.category = "weekly_digest"
-            existing.subject_template = subject
-            existing.body_html = html
-            existing.variables = [
-                "user_name",
-                "count",
-                "assignments",
-                "app_url",
-                "assignments_html",
-                "smart_signals",
-                "smart_signals_total_open",
-                "smart_signals_section_html",
+        Loads the existing defaults in one query and writes only the templates
+        whose seeded fields differ, with a single upsert in one transaction.
+        """
+        specs = self._default_specs()
+        existing = self.repo.get_many_by_names([spec["name"] for spec in specs])
+        changed = [
+            spec for spec in specs
+            if spec["name"] not in existing or not stores_seeded_values(existing[spec["name"]], spec)
+        ]
+        if changed:
+            revisions = self._record_changes([spec["name"] for spec in changed])
+            rows = [
+                ServiceEmailTemplate(**spec, is_active=True, revision=revisions[spec["name"]]).model_dump(exclude={"id"})
+                for spec in changed
             ]
-            return self.repo.update(existing)
-        else:
-            entity = ServiceEmailTemplate(
-                name="weekly_digest",
-                category="weekly_digest",
-                subject_template=subject,
-                body_html=html,
-                variables=[
-                    "user_name",
-                    "count",
-                    "assignments",
-                    "app_url",
-                    "assignments_html",
-                    "smart_signals",
-                    "smart_signals_total_open",
-                    "smart_signals_section_html",
-                ],
-                is_active=True,
-            )
-            return self.repo.create(entity)
+            self.repo.upsert_by_name(rows, update_fields=[*specs[0], "revision"])
+            # One query reloads every default (the commit expired the instances)
+            existing = self.repo.get_many_by_names(spec["name"] for spec in specs)
+        return [existing[spec["name"]] for spec in specs]
 
-    def ensure_password_reset_default(self) -> ServiceEmailTemplate:
-        """Create or update default password reset email template from built-ins."""
-        from app.email.templates import EmailTemplates  # local import to avoid cycles
 
-        existing = self.repo.get_by_name("password_reset")
+class ChangeFeedService:
+    """Revision-based change feed over ServiceCMSChange for cache consumers."""
 
-        placeholder_ctx = {
-            "user_name": "{user_name}",
-            "reset_url": "{reset_url}",
-        }
-        html = EmailTemplates(self.db).render_password_reset(placeholder_ctx)
+    PAGE_LIMIT = 1000
 
-        subject = "Password Reset Request - Queast"
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ChangeLogRepository(db)
 
-        if existing:
-            existing.category = "password_reset"
-            existing.subject_template = subject
-            existing.body_html = html
-            existing.variables = [
-                "user_name",
-                "reset_url",
-            ]
-            return self.repo.update(existing)
-        else:
-            entity = ServiceEmailTemplate(
-                name="password_reset",
-                category="password_reset",
-                subject_template=subject,
-                body_html=html,
-                variables=[
-                    "user_name",
-                    "reset_url",
-                ],
-                is_active=True,
-            )
-            return self.repo.create(entity)
+    def changes_since(self, since: int, *, entity_types: Tuple[str, ...]) -> Dict[str, Any]:
+        """Latest action per key changed after `since`.
 
-    def ensure_usage_alert_default(self) -> ServiceEmailTemplate:
-        """Create or update default usage alert email template from built-ins."""
-        from app.email.templates import EmailTemplates  # local import to avoid cycles
-
-        existing = self.repo.get_by_name("usage_alert")
-
-        placeholder_ctx = {
-            "tenant_name": "{tenant_name}",
-            "usage_type": "{usage_type}",
-            "percentage": "{percentage}",
-            "current_usage": "{current_usage}",
-            "limit": "{limit}",
-            "remaining": "{remaining}",
-            "app_url": "{app_url}",
+        `revision` is the cursor for the next call; `has_more` means the page
+        limit was hit and the caller should immediately ask again.
+        """
+        rows = self.repo.list_since(since, entity_types=entity_types, limit=self.PAGE_LIMIT)
+        latest: Dict[Tuple[str, str], Any] = {}
+        for row in rows:
+            latest.pop((row.entity_type, row.key), None)
+            latest[(row.entity_type, row.key)] = row
+        # Never jump past ids that are not visible yet: an empty page keeps the cursor
+        revision = rows[-1].id if rows else since
+        return {
+            "revision": revision,
+            "has_more": len(rows) == self.PAGE_LIMIT,
+            "changes": [
+                {"type": row.entity_type, "key": row.key, "action": row.action, "revision": row.id}
+                for row in latest.values()
+            ],
         }
-        html = EmailTemplates(self.db).render_usage_alert(placeholder_ctx)
-
-        subject = "Usage Alert: {usage_type} at {percentage}% of limit"
-
-        if existing:
-            existing.category = "usage_alert"
-            existing.subject_template = subject
-            existing.body_html = html
-            existing.variables = [
-                "tenant_name",
-                "usage_type",
-                "percentage",
-                "current_usage",
-                "limit",
-                "remaining",
-                "app_url",
-            ]
-            return self.repo.update(existing)
-        else:
-            entity = ServiceEmailTemplate(
-                name="usage_alert",
-                category="usage_alert",
-                subject_template=subject,
-                body_html=html,
-                variables=[
-                    "tenant_name",
-                    "usage_type",
-                    "percentage",
-                    "current_usage",
-                    "limit",
-                    "remaining",
-                    "app_url",
-                ],
-                is_active=True,
-            )
-            return self.repo.create(entity)
-
-    def ensure_all_defaults(self) -> List[ServiceEmailTemplate]:
-        """Ensure all standard email templates exist (idempotent)."""
-        results: List[ServiceEmailTemplate] = []
-        results.append(self.ensure_invitation_default())
-        results.append(self.ensure_daily_digest_default())
-        results.append(self.ensure_weekly_digest_default())
-        results.append(self.ensure_password_reset_default())
-        results.append(self.ensure_usage_alert_default())
-        return results
 
 
 def get_supported_variables() -> dict:
@@ -433,13 +712,28 @@ def get_supported_variables() -> dict:
 
 
 class NotificationTemplateAdminService:
-    """Thin admin service around NotificationRepository for NotificationTemplate CRUD."""
+    """Thin admin service around NotificationRepository for NotificationTemplate CRUD.
+
+    Writes drop the dispatch cache (`notification_cache`) in every worker.
+    """
+    change_type = "notification_template"
+
     def __init__(self, db: Session):
         self.db = db
         self.repo = NotificationRepository(db)
+        self.bulk_repo = NotificationTemplateRepository(db)
+
+    def list_rows(self, columns: Sequence[str], **filters: Any) -> List[Dict[str, Any]]:
+        """Selected columns as plain dicts (no ORM instances), ordered by id.
+
+        Filters: `template_type`, `category`, `is_active`, `is_default`,
+        `after_id` (keyset cursor) and `limit`.
+        """
+        return self.bulk_repo.list_rows(columns, **filters)
 
-    def list(self, template_type: Optional[str] = None, category: Optional[str] = None) -> List[NotificationTemplate]:
-        return self.repo.get_templates_by_criteria(template_type=template_type, category=category)
+    def list_summaries(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Body-less rows for the admin table (same filters as `list_rows`)."""
+        return self.bulk_repo.list_summaries(**filters)
 
     def get(self, template_id: int) -> NotificationTemplate:
         entity = self.db.get(NotificationTemplate, template_id)
@@ -447,52 +741,214 @@ class NotificationTemplateAdminService:
             raise HTTPException(status_code=404, detail="Template not found")
         return entity
 
+    @staticmethod
+    def _update_error(entity: NotificationTemplate, updates: Dict[str, Any]) -> Optional[str]:
+        # Field-level checks happen in NotificationTemplateUpdate; this is the cross-row rule
+        template_type = updates.get('template_type') or entity.template_type
+        subject = updates.get('subject_template') or entity.subject_template
+        if template_type == 'email' and not subject:
+            return "Email templates must have a subject_template"
+        return None
+
     def create(self, data: Dict[str, Any]) -> NotificationTemplate:
-        # Basic validation similar to NotificationService
-        required = ['name', 'template_type', 'category', 'body_template']
-        for f in required:
-            if not data.get(f):
-                raise HTTPException(status_code=400, detail=f"Missing required field: {f}")
-        if data['template_type'] not in {'email', 'slack'}:
-            raise HTTPException(status_code=400, detail="Invalid template type")
-        if data['template_type'] == 'email' and not data.get('subject_template'):
-            raise HTTPException(status_code=400, detail="Email templates must have a subject_template")
-        return self.repo.create_template(data)
+        """Create from a validated `NotificationTemplateCreate` dump (no re-validation here)."""
+        self._announce([data['name']])
+        entity = self.repo.create_template(data)
+        invalidate_notification_templates()
+        return entity
 
     def update(self, template_id: int, updates: Dict[str, Any]) -> NotificationTemplate:
         entity = self.get(template_id)
+        error = self._update_error(entity, updates)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+        self._announce([entity.name, updates.get('name')])
         for k, v in updates.items():
             if v is not None:
                 setattr(entity, k, v)
-        return self.repo.update_template(entity)
+        entity = self.repo.update_template(entity)
+        invalidate_notification_templates()
+        return entity
 
     def delete(self, template_id: int) -> None:
         entity = self.get(template_id)
+        self._announce([entity.name])
         self.db.delete(entity)
         self.db.commit()
+        invalidate_notification_templates()
+
+    def bulk_apply(
+        self,
+        *,
+        create: List[Dict[str, Any]],
+        update: List[Dict[str, Any]],
+        delete: List[int],
+    ) -> List[Dict[str, Any]]:
+        """Validate every item, then apply all creates/updates/deletes in one transaction.
+
+        Creates arrive schema-validated; updates and deletes are checked against
+        the stored rows, and creates/renames against existing and in-batch
+        `(name, template_type)` pairs. Nothing is written if any item is invalid: the 400 detail lists
+        `{"op", "index", "detail"}` for every failing item. On success returns
+        one `{"op", "index", "id", "template"}` result per item, creates first,
+        then updates, then deletes (`template` is None for deletes).
+        """
+        ids = [item['id'] for item in update] + list(delete)
+        found = {tpl.id: tpl for tpl in self.bulk_repo.list_by_ids(ids)}
+        errors: List[Dict[str, Any]] = []
+        seen: set = set()
+        for op, items in (("update", [item['id'] for item in update]), ("delete", list(delete))):
+            for index, template_id in enumerate(items):
+                if template_id not in found:
+                    errors.append({"op": op, "index": index, "detail": f"Template {template_id} not found"})
+                elif template_id in seen:
+                    errors.append({"op": op, "index": index, "detail": f"Template {template_id} appears more than once"})
+                elif op == "update":
+                    error = self._update_error(found[template_id], update[index])
+                    if error:
+                        errors.append({"op": op, "index": index, "detail": error})
+                seen.add(template_id)
+        errors.extend(self._name_conflicts(create, update, found))
+        if errors:
+            raise HTTPException(status_code=400, detail={"errors": errors})
+
+        # Old names of updated/deleted rows as well as new ones, captured before mutation
+        touched = [data['name'] for data in create] + [found[template_id].name for template_id in ids]
+        touched += [data.get('name') for data in update]
+        created = [NotificationTemplate(**data) for data in create]
+        updated: List[NotificationTemplate] = []
+        for data in update:
+            entity = found[data['id']]
+            for k, v in data.items():
+                if k != 'id' and v is not None:
+                    setattr(entity, k, v)
+            updated.append(entity)
+        deleted = [found[template_id] for template_id in delete]
+        self._announce(touched)
+        created_ids = self.bulk_repo.apply_changes(create=created, update=updated, delete=deleted)
+        invalidate_notification_templates()
+
+        updated_ids = [data['id'] for data in update]
+        written = {tpl.id: tpl for tpl in self.bulk_repo.list_by_ids(created_ids + updated_ids)}
+        results: List[Dict[str, Any]] = []
+        for op, op_ids in (("create", created_ids), ("update", updated_ids)):
+            results.extend(
+                {"op": op, "index": index, "id": template_id, "template": written.get(template_id)}
+                for index, template_id in enumerate(op_ids)
+            )
+        results.extend(
+            {"op": "delete", "index": index, "id": template_id, "template": None}
+            for index, template_id in enumerate(delete)
+        )
+        return results
+
+    def _name_conflicts(
+        self,
+        create: List[Dict[str, Any]],
+        update: List[Dict[str, Any]],
+        found: Dict[int, NotificationTemplate],
+    ) -> List[Dict[str, Any]]:
+        """Errors for creates/renames that would duplicate a `(name, template_type)` pair.
+
+        Pairs held by stored rows count as taken even if the batch deletes or
+        renames those rows, since all changes land in one flush.
+        """
+        claims = [("create", index, (data['name'], data['template_type'])) for index, data in enumerate(create)]
+        for index, data in enumerate(update):
+            entity = found.get(data['id'])
+            if entity is None:
+                continue
+            key = (data.get('name') or entity.name, data.get('template_type') or entity.template_type)
+            if key != (entity.name, entity.template_type):
+                claims.append(("update", index, key))
+        stored = self.bulk_repo.existing_name_types(name for _, _, (name, _) in claims)
+        taken: Dict[Tuple[str, str], str] = {key: "already exists" for key in stored}
+        errors: List[Dict[str, Any]] = []
+        for op, index, key in claims:
+            if key in taken:
+                errors.append({"op": op, "index": index, "detail": f"Template '{key[0]}' ({key[1]}) {taken[key]}"})
+            else:
+                taken[key] = "appears more than once"
+        return errors
+
+    def _announce(self, names: List[Optional[str]]) -> None:
+        # Published inside the write's transaction (before its commit), like CMS block writes
+        publish_invalidation(self.db, self.change_type, [n for n in dict.fromkeys(names) if n])
 
     def import_missing_defaults(self) -> List[NotificationTemplate]:
-        """Ensure a baseline set of notification templates exist (idempotent)."""
-        created: List[NotificationTemplate] = []
-        existing_by_key: dict[tuple[str, str], NotificationTemplate] = {}
-
-        # Helper to check existence by (name, template_type)
-        def _get(name: str, template_type: str) -> Optional[NotificationTemplate]:
-            key = (name, template_type)
-            if key in existing_by_key:
-                return existing_by_key[key]
-            tpl = self.repo.get_template_by_name(name, template_type)
-            if tpl:
-                existing_by_key[key] = tpl
-            return tpl
-
-        if not DEFAULT_NOTIFICATION_TEMPLATES:
+        """Ensure a baseline set of notification templates exist (idempotent).
+
+        One query finds the existing `(name, template_type)` pairs, one batched
+        insert adds the missing ones.
+        """
+        seeds = default_notification_templates()
+        if not seeds:
             raise RuntimeError("CMS seed notification templates missing (cms/seeds/templates/notification_templates/defaults.json)")
 
-        for data in DEFAULT_NOTIFICATION_TEMPLATES:
-            name = data["name"]
-            template_type = data["template_type"]
-            if not _get(name, template_type):
-                created.append(self.repo.create_template(data))
+        existing = self.bulk_repo.existing_name_types(data["name"] for data in seeds)
+        missing: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for data in seeds:
+            key = (data["name"], data["template_type"])
+            if key not in existing:
+                missing.setdefault(key, data)
+        if not missing:
+            return []
+        # Seed dicts are shared by the loader cache, so each row gets its own copy
+        self._announce([name for name, _ in missing])
+        self.bulk_repo.create_many([NotificationTemplate(**dict(data)) for data in missing.values()])
+        invalidate_notification_templates()
+        stored = {
+            (tpl.name, tpl.template_type): tpl
+            for tpl in self.bulk_repo.list_by_names(name for name, _ in missing)
+        }
+        return [stored[key] for key in missing if key in stored]
+
+
+def find_variable_usages(db: Session, name: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Email templates and content blocks whose stored placeholders include `name`."""
+    return {
+        "email_templates": EmailTemplateRepository(db).find_by_placeholder(name),
+        "blocks": ContentBlockRepository(db).find_by_placeholder(name),
+    }
+
 
-        return created
+REINDEX_BATCH_SIZE = 500
+
+
+def _keyset_rows(fetch: Any) -> Iterator[Dict[str, Any]]:
+    """Every row of an id-ordered `fetch(after_id)` source, one batch at a time."""
+    after_id = 0
+    while rows := fetch(after_id):
+        yield from rows
+        after_id = rows[-1]["id"]
+
+
+def reindex_placeholders(db: Session) -> Dict[str, int]:
+    """Recompute the stored `placeholders` of every block and email template.
+
+    Backfills rows written before the column existed. Like default seeding it
+    records what each body uses without checking `variables`, and only rows
+    whose list changes are written. Returns the number of rows updated.
+    """
+    blocks = ContentBlockRepository(db)
+    templates = EmailTemplateRepository(db)
+    block_updates: Dict[int, List[str]] = {}
+    block_keys: List[str] = []
+    for row in _keyset_rows(lambda after_id: blocks.placeholder_sources(after_id, REINDEX_BATCH_SIZE)):
+        names = [] if row["category"] == PRODUCT_TOUR_CATEGORY else extract_placeholders(row["html_content"])
+        if names != (row["placeholders"] or []):
+            block_updates[row["id"]] = names
+            block_keys.append(row["key"])
+    template_updates: Dict[int, List[str]] = {}
+    for row in _keyset_rows(lambda after_id: templates.placeholder_sources(after_id, REINDEX_BATCH_SIZE)):
+        names = extract_placeholders(row["subject_template"], row["body_html"])
+        if names != (row["placeholders"] or []):
+            template_updates[row["id"]] = names
+
+    # Cached public blocks carry `placeholders`; drop them in every worker
+    publish_invalidation(db, ContentBlockService.change_type, block_keys)
+    blocks.set_placeholders(block_updates)
+    templates.set_placeholders(template_updates)
+    db.commit()
+    invalidate_block_keys(*block_keys)
+    return {"blocks": len(block_updates), "email_templates": len(template_updates)}
@@ -0,0 +1,16 @@
+"""CMS test fixtures."""
+from __future__ import annotations
+
+import pytest
+
+from app.cms.cache import notification_template_cache, public_block_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_cms_caches():
+    """Process-wide CMS caches must not leak rows between per-test databases."""
+    public_block_cache.clear()
+    notification_template_cache.clear()
+    yield
+    public_block_cache.clear()
+    notification_template_cache.clear()
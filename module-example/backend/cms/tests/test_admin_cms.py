@@ -69,7 +69,7 @@ class TestAdminCMSHTTP:
                 "key": "tour_filter_demo",
                 "category": "product_tour",
                 "title": "Tour filter demo",
-                "html_content": "{}",
+                "html_content": '{"steps": [{"id": "intro", "text": "Hi"}]}',
                 "variables": [],
             },
         )
@@ -145,3 +145,83 @@ class TestAdminCMSHTTP:
     def test_non_super_admin_forbidden(self, client, auth_headers):
         resp = client.get("/api/v1/admin/cms/blocks", headers=auth_headers)
         assert resp.status_code in (401, 403)
+
+
+class TestEmailTemplateListing:
+    def test_keyset_cursor_and_optional_total(self, client, super_admin_headers):
+        for i in range(3):
+            resp = client.post(
+                "/api/v1/admin/cms/email-templates",
+                headers=super_admin_headers,
+                json={
+                    "name": f"page_tpl_{i}",
+                    "category": "generic",
+                    "subject_template": "Subject",
+                    "body_html": "Body",
+                },
+            )
+            assert resp.status_code == 201, resp.text
+
+        first = client.get("/api/v1/admin/cms/email-templates?limit=2&search=page_tpl_", headers=super_admin_headers)
+        assert first.status_code == 200
+        assert "x-total-count" not in first.headers
+        cursor = first.headers["x-next-cursor"]
+
+        second = client.get(
+            f"/api/v1/admin/cms/email-templates?limit=2&search=page_tpl_&after_id={cursor}&include_total=true",
+            headers=super_admin_headers,
+        )
+        assert second.status_code == 200
+        assert second.headers["x-total-count"] == "3"
+        names = [it["name"] for it in first.json() + second.json()]
+        assert names == ["page_tpl_0", "page_tpl_1", "page_tpl_2"]
+        assert "x-next-cursor" not in second.headers
+
+    def test_full_search_mode_matches_subject_and_body_ranked(self, client, super_admin_headers):
+        payloads = [
+            {"name": "ranked_body", "subject_template": "Hello", "body_html": "about quarterly report"},
+            {"name": "quarterly_name", "subject_template": "Hi", "body_html": "Body"},
+            {"name": "ranked_subject", "subject_template": "Your quarterly stats", "body_html": "Body"},
+        ]
+        for p in payloads:
+            resp = client.post(
+                "/api/v1/admin/cms/email-templates",
+                headers=super_admin_headers,
+                json={"category": "generic", **p},
+            )
+            assert resp.status_code == 201, resp.text
+
+        by_name = client.get("/api/v1/admin/cms/email-templates?search=quarterly", headers=super_admin_headers)
+        assert [it["name"] for it in by_name.json()] == ["quarterly_name"]
+
+        full = client.get(
+            "/api/v1/admin/cms/email-templates?search=quarterly&search_mode=full", headers=super_admin_headers
+        )
+        assert full.status_code == 200
+        assert [it["name"] for it in full.json()] == ["quarterly_name", "ranked_subject", "ranked_body"]
+
+
+class TestContentBlockSummaries:
+    def test_summary_listing_omits_body_and_pages(self, client, super_admin_headers):
+        for i in range(3):
+            resp = client.post(
+                "/api/v1/admin/cms/blocks",
+                headers=super_admin_headers,
+                json={"key": f"summary_{i}", "category": "summary_demo", "title": f"Summary {i}", "html_content": "x" * (10 + i)},
+            )
+            assert resp.status_code == 201, resp.text
+
+        first = client.get("/api/v1/admin/cms/blocks/summary?category=summary_demo&limit=2", headers=super_admin_headers)
+        assert first.status_code == 200, first.text
+        rows = first.json()
+        assert [r["key"] for r in rows] == ["summary_0", "summary_1"]
+        assert "html_content" not in rows[0]
+        assert rows[1]["content_length"] == 11
+
+        cursor = first.headers["x-next-cursor"]
+        second = client.get(
+            f"/api/v1/admin/cms/blocks/summary?category=summary_demo&limit=2&after_id={cursor}",
+            headers=super_admin_headers,
+        )
+        assert [r["key"] for r in second.json()] == ["summary_2"]
+        assert "x-next-cursor" not in second.headers
@@ -0,0 +1,137 @@
+"""CMS read-through cache for public block lookups."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.cms.cache import SingleFlight, TTLCache, public_block_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_miss_and_lru_eviction(self):
+        cache: TTLCache[int] = TTLCache(maxsize=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a becomes most recent
+        cache.set("c", 3)  # evicts b
+        assert cache.get("b", None) is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.evictions == 1
+
+    def test_entries_expire_after_ttl(self):
+        clock = _Clock()
+        cache: TTLCache[int] = TTLCache(maxsize=4, ttl_seconds=5, clock=clock)
+        cache.set("a", 1)
+        clock.now = 6
+        with pytest.raises(KeyError):
+            cache.get("a")
+        assert cache.stats.expirations == 1
+
+    def test_get_or_load_caches_none(self):
+        calls = []
+        cache: TTLCache[None] = TTLCache(maxsize=4, ttl_seconds=10)
+        for _ in range(3):
+            assert cache.get_or_load("missing", lambda: calls.append(1)) is None
+        assert len(calls) == 1
+
+    def test_load_racing_an_invalidation_is_not_cached(self):
+        cache: TTLCache[str] = TTLCache(maxsize=4, ttl_seconds=10)
+
+        def load_while_invalidated():
+            cache.clear()  # a write lands while the loader is reading
+            return "pre-write"
+
+        assert cache.get_or_load("k", load_while_invalidated) == "pre-write"
+        assert cache.get("k", None) is None
+        assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+        assert cache.get("k") == "fresh"
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        results = []
+
+        def heal():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return "healed"
+
+        def call():
+            results.append(flight.do("tos", heal, timeout=2))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(2)
+        followers = [threading.Thread(target=call) for _ in range(4)]
+        for t in followers:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in [leader, *followers]:
+            t.join()
+        assert results == ["healed"] * 5
+        assert len(calls) == 1
+
+    def test_follower_times_out_while_leader_runs(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(2)
+            return 1
+
+        leader = threading.Thread(target=lambda: flight.do("k", slow))
+        leader.start()
+        started.wait(2)
+        with pytest.raises(TimeoutError):
+            flight.do("k", slow, timeout=0.01)
+        release.set()
+        leader.join()
+
+
+class TestPublicBlockCacheHTTP:
+    def test_admin_update_invalidates_public_read(self, client, super_admin_headers):
+        create = client.post(
+            "/api/v1/admin/cms/blocks",
+            headers=super_admin_headers,
+            json={"key": "cache_demo", "title": "Cache demo", "html_content": "v1"},
+        )
+        assert create.status_code == 201, create.text
+        bid = create.json()["id"]
+
+        assert client.get("/api/v1/cms/blocks/cache_demo").json()["html_content"] == "v1"
+        assert client.get("/api/v1/cms/blocks/cache_demo").json()["html_content"] == "v1"
+        assert public_block_cache.stats.hits >= 1
+
+        resp = client.put(
+            f"/api/v1/admin/cms/blocks/{bid}",
+            headers=super_admin_headers,
+            json={"html_content": "v2"},
+        )
+        assert resp.status_code == 200, resp.text
+        assert client.get("/api/v1/cms/blocks/cache_demo").json()["html_content"] == "v2"
+
+        client.delete(f"/api/v1/admin/cms/blocks/{bid}", headers=super_admin_headers)
+        assert client.get("/api/v1/cms/blocks/cache_demo").status_code == 404
+
+    def test_cache_stats_endpoint(self, client, super_admin_headers):
+        resp = client.get("/api/v1/admin/cms/cache-stats", headers=super_admin_headers)
+        assert resp.status_code == 200
+        stats = resp.json()["public_blocks"]
+        assert {"hits", "misses", "evictions", "size"} <= set(stats)
@@ -0,0 +1,51 @@
+"""CMS change feed: revisions and GET /cms/changes."""
+from __future__ import annotations
+
+
+def test_change_feed_reports_upserts_and_deletes(client, super_admin_headers):
+    start = client.get("/api/v1/cms/changes").json()["revision"]
+
+    create = client.post(
+        "/api/v1/admin/cms/blocks",
+        headers=super_admin_headers,
+        json={"key": "feed_demo", "title": "Feed demo", "html_content": "v1"},
+    )
+    assert create.status_code == 201, create.text
+    block = create.json()
+    assert block["revision"] > start
+
+    feed = client.get(f"/api/v1/cms/changes?since={start}").json()
+    assert feed["changes"] == [{"type": "block", "key": "feed_demo", "action": "upsert", "revision": block["revision"]}]
+    cursor = feed["revision"]
+
+    client.put(f"/api/v1/admin/cms/blocks/{block['id']}", headers=super_admin_headers, json={"key": "feed_demo_2"})
+    changes = client.get(f"/api/v1/cms/changes?since={cursor}").json()["changes"]
+    assert {(c["key"], c["action"]) for c in changes} == {("feed_demo", "delete"), ("feed_demo_2", "upsert")}
+
+
+def test_public_feed_excludes_email_templates(client, super_admin_headers):
+    start = client.get("/api/v1/cms/changes").json()["revision"]
+    resp = client.post(
+        "/api/v1/admin/cms/email-templates",
+        headers=super_admin_headers,
+        json={"name": "feed_tpl", "category": "generic", "subject_template": "S", "body_html": "B"},
+    )
+    assert resp.status_code == 201, resp.text
+
+    assert client.get(f"/api/v1/cms/changes?since={start}").json()["changes"] == []
+    admin = client.get(f"/api/v1/admin/cms/changes?since={start}", headers=super_admin_headers).json()
+    assert [(c["type"], c["key"]) for c in admin["changes"]] == [("email_template", "feed_tpl")]
+
+
+def test_rejected_writes_are_not_logged_and_empty_pages_keep_the_cursor(client, super_admin_headers):
+    start = client.get("/api/v1/cms/changes").json()["revision"]
+
+    rejected = client.post(
+        "/api/v1/admin/cms/blocks",
+        headers=super_admin_headers,
+        json={"key": "feed_bad", "title": "Bad", "html_content": "Hi {undeclared}"},
+    )
+    assert rejected.status_code == 400
+
+    feed = client.get(f"/api/v1/admin/cms/changes?since={start}", headers=super_admin_headers).json()
+    assert feed == {"revision": start, "has_more": False, "changes": []}
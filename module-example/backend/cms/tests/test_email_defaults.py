@@ -0,0 +1,44 @@
+"""Admin CMS: bulk seeding of default email templates."""
+from __future__ import annotations
+
+
+DEFAULT_NAMES = ["invitation", "daily_digest", "weekly_digest", "password_reset", "usage_alert"]
+
+
+def test_import_missing_email_templates_upserts_in_bulk(client, super_admin_headers):
+    resp = client.post("/api/v1/admin/cms/email-templates/import-missing", headers=super_admin_headers)
+    assert resp.status_code == 200, resp.text
+    first = {tpl["name"]: tpl for tpl in resp.json()}
+    assert list(first) == DEFAULT_NAMES
+
+    edited = client.put(
+        f"/api/v1/admin/cms/email-templates/{first['password_reset']['id']}",
+        headers=super_admin_headers,
+        json={"subject_template": "Locally edited"},
+    )
+    assert edited.status_code == 200, edited.text
+
+    resp = client.post("/api/v1/admin/cms/email-templates/import-missing", headers=super_admin_headers)
+    assert resp.status_code == 200, resp.text
+    second = {tpl["name"]: tpl for tpl in resp.json()}
+    assert {n: t["id"] for n, t in second.items()} == {n: t["id"] for n, t in first.items()}
+    assert second["password_reset"]["subject_template"] == first["password_reset"]["subject_template"]
+
+
+def test_reseeding_unchanged_defaults_skips_writes(client, super_admin_headers):
+    first = client.post("/api/v1/admin/cms/email-templates/load-defaults", headers=super_admin_headers)
+    assert first.status_code == 200, first.text
+    start = client.get("/api/v1/admin/cms/changes", headers=super_admin_headers).json()["revision"]
+
+    # Re-running the same seeds must not touch the rows: every write records a new revision
+    second = client.post("/api/v1/admin/cms/email-templates/load-defaults", headers=super_admin_headers)
+    assert second.status_code == 200
+    assert second.json()["revision"] == first.json()["revision"]
+    seeded = client.post("/api/v1/admin/cms/email-templates/import-missing", headers=super_admin_headers).json()
+    again = client.post("/api/v1/admin/cms/email-templates/import-missing", headers=super_admin_headers).json()
+    assert [t["revision"] for t in again] == [t["revision"] for t in seeded]
+    invitation = next(t for t in again if t["name"] == "invitation")
+    assert invitation["revision"] == first.json()["revision"]
+
+    changes = client.get(f"/api/v1/admin/cms/changes?since={start}", headers=super_admin_headers).json()["changes"]
+    assert "invitation" not in [c["key"] for c in changes]
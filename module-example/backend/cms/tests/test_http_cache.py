@@ -0,0 +1,71 @@
+"""Conditional GET helpers used by public CMS endpoints."""
+from __future__ import annotations
+
+import gzip
+from datetime import datetime
+
+from starlette.requests import Request
+
+from app.cms.cache import compressed_body_cache
+from app.cms.http_cache import conditional_json_response, conditional_response, http_date, negotiate_encoding
+
+
+def _request(headers: dict[str, str]) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_if_none_match_accepts_weak_and_list_forms():
+    payload = {"title": "Terms"}
+    etag = conditional_json_response(_request({}), payload).headers["etag"]
+    resp = conditional_json_response(_request({"If-None-Match": f'"other", W/{etag}'}), payload)
+    assert resp.status_code == 304
+
+
+def test_if_modified_since_used_without_etag():
+    modified = datetime(2025, 1, 2, 3, 4, 5, 678)
+    resp = conditional_json_response(
+        _request({"If-Modified-Since": http_date(modified)}), {"a": 1}, last_modified=modified
+    )
+    assert resp.status_code == 304
+    assert resp.headers["last-modified"] == "Thu, 02 Jan 2025 03:04:05 GMT"
+
+
+def test_negotiate_encoding_honours_q_values():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") in {"br", "gzip"}
+
+
+def test_compressible_response_gets_coding_specific_etag():
+    body = b'{"steps":[' + b'{"id":"x"},' * 100 + b'{"id":"y"}]}'
+    plain = conditional_response(_request({}), body, media_type="application/json", compressible=True)
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    gz = conditional_response(
+        _request({"Accept-Encoding": "gzip"}), body, media_type="application/json", compressible=True
+    )
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(gz.body) == body
+    assert gz.headers["etag"] != plain.headers["etag"]
+    revalidated = conditional_response(
+        _request({"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}),
+        body,
+        media_type="application/json",
+        compressible=True,
+    )
+    assert revalidated.status_code == 304
+
+
+def test_compressed_variant_is_computed_once_per_body():
+    body = b"x" * 4096 + b"unique-body-for-cache-test"
+    request = _request({"Accept-Encoding": "gzip"})
+    before = compressed_body_cache.snapshot_stats()
+    first = conditional_response(request, body, media_type="text/html", compressible=True)
+    second = conditional_response(request, body, media_type="text/html", compressible=True)
+    after = compressed_body_cache.snapshot_stats()
+    assert first.body == second.body
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
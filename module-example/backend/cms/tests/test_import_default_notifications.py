@@ -0,0 +1,45 @@
+"""Admin CMS: import missing default notification templates"""
+from __future__ import annotations
+
+from app.cms import service as cms_service
+
+URL = "/api/v1/admin/cms/notification-templates"
+
+
+def _seed(name, template_type, body):
+    return {
+        "name": name,
+        "template_type": template_type,
+        "category": "seeded",
+        "subject_template": f"{name} subject" if template_type == "email" else None,
+        "body_template": body,
+        "variables": [],
+        "is_active": True,
+        "is_default": True,
+    }
+
+
+def test_import_missing_inserts_only_absent_defaults(client, super_admin_headers, monkeypatch):
+    seeds = [_seed("seed_a", "email", "seed body"), _seed("seed_a", "slack", "seed body"), _seed("seed_b", "email", "seed body")]
+    monkeypatch.setattr(cms_service, "default_notification_templates", lambda: seeds)
+
+    existing = client.post(
+        URL,
+        headers=super_admin_headers,
+        json={**_seed("seed_a", "email", "customized body"), "is_default": False},
+    )
+    assert existing.status_code == 201, existing.text
+
+    resp = client.post(f"{URL}/import-missing", headers=super_admin_headers)
+    assert resp.status_code == 200, resp.text
+    assert sorted((t["name"], t["template_type"]) for t in resp.json()) == [("seed_a", "slack"), ("seed_b", "email")]
+
+    stored = [t for t in client.get(URL, headers=super_admin_headers).json() if t["category"] == "seeded"]
+    assert len(stored) == 3
+    kept = next(t for t in stored if (t["name"], t["template_type"]) == ("seed_a", "email"))
+    assert kept["id"] == existing.json()["id"]
+    assert kept["body_template"] == "customized body"
+
+    again = client.post(f"{URL}/import-missing", headers=super_admin_headers)
+    assert again.status_code == 200
+    assert again.json() == []
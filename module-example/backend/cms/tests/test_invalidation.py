@@ -0,0 +1,49 @@
+"""Cross-worker cache invalidation bus."""
+from __future__ import annotations
+
+import json
+
+from app.cms import invalidation
+from app.cms.cache import public_block_cache
+from app.cms.invalidation import InProcessBackend, PostgresNotifyBackend
+
+
+def test_admin_block_write_is_broadcast(client, super_admin_headers):
+    seen = []
+    bus = invalidation.get_invalidation_bus()
+
+    def handler(entity_type, keys):
+        seen.append((entity_type, keys))
+
+    bus.subscribe(handler)
+    try:
+        resp = client.post(
+            "/api/v1/admin/cms/blocks",
+            headers=super_admin_headers,
+            json={"key": "bus_demo", "title": "Bus demo", "html_content": "v1"},
+        )
+    finally:
+        bus.unsubscribe(handler)
+    assert resp.status_code == 201, resp.text
+    assert ("block", ["bus_demo"]) in seen
+
+
+def test_remote_event_drops_cached_block():
+    backend = invalidation.configure_invalidation_bus(PostgresNotifyBackend("postgresql://unused"))
+    try:
+        public_block_cache.set(("remote_key", None), None)
+        public_block_cache.set(("other_key", None), None)
+        backend._handle(json.dumps({"type": "block", "keys": ["remote_key"]}))
+        backend._handle("not json")
+        assert public_block_cache.get(("remote_key", None), "gone") == "gone"
+        assert public_block_cache.get(("other_key", None), "gone") is None
+    finally:
+        invalidation.configure_invalidation_bus(InProcessBackend())
+
+
+def test_notify_payloads_stay_under_limit():
+    keys = [f"key_{i:05d}_" + "x" * 40 for i in range(500)]
+    payloads = PostgresNotifyBackend._payloads("block", keys)
+    assert len(payloads) > 1
+    assert all(len(p.encode("utf-8")) < 8000 for p in payloads)
+    assert [k for p in payloads for k in json.loads(p)["keys"]] == keys
@@ -0,0 +1,106 @@
+"""Bulk create/update/delete for notification templates."""
+from __future__ import annotations
+
+BULK_URL = "/api/v1/admin/cms/notification-templates/bulk"
+
+
+def _template(name: str, **overrides):
+    return {
+        "name": name,
+        "template_type": "email",
+        "category": "alerts",
+        "subject_template": f"{name} subject",
+        "body_template": f"{name} body",
+        **overrides,
+    }
+
+
+def test_bulk_applies_all_operations(client, super_admin_headers):
+    seeded = client.post(
+        BULK_URL, headers=super_admin_headers, json={"create": [_template("bulk_a"), _template("bulk_b")]}
+    )
+    assert seeded.status_code == 200, seeded.text
+    ids = [r["id"] for r in seeded.json()["results"]]
+    assert [r["template"]["name"] for r in seeded.json()["results"]] == ["bulk_a", "bulk_b"]
+
+    resp = client.post(
+        BULK_URL,
+        headers=super_admin_headers,
+        json={
+            "create": [_template("bulk_c", template_type="slack", subject_template=None)],
+            "update": [{"id": ids[0], "body_template": "localized body"}],
+            "delete": [ids[1]],
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert [(r["op"], r["index"]) for r in results] == [("create", 0), ("update", 0), ("delete", 0)]
+    assert results[1]["template"]["body_template"] == "localized body"
+    assert results[2] == {"op": "delete", "index": 0, "id": ids[1], "template": None}
+
+    names = {t["name"] for t in client.get("/api/v1/admin/cms/notification-templates", headers=super_admin_headers).json()}
+    assert {"bulk_a", "bulk_c"} <= names and "bulk_b" not in names
+
+
+def test_bulk_is_all_or_nothing(client, super_admin_headers):
+    slack = client.post(
+        BULK_URL,
+        headers=super_admin_headers,
+        json={"create": [_template("bulk_slack", template_type="slack", subject_template=None)]},
+    ).json()["results"][0]["id"]
+
+    resp = client.post(
+        BULK_URL,
+        headers=super_admin_headers,
+        json={
+            "create": [_template("bulk_ok")],
+            "update": [{"id": slack, "template_type": "email"}],
+            "delete": [999999],
+        },
+    )
+    assert resp.status_code == 400
+    errors = resp.json()["detail"]["errors"]
+    assert {(e["op"], e["index"]) for e in errors} == {("update", 0), ("delete", 0)}
+
+    names = {t["name"] for t in client.get("/api/v1/admin/cms/notification-templates", headers=super_admin_headers).json()}
+    assert "bulk_ok" not in names
+
+
+def test_bulk_create_items_are_schema_validated(client, super_admin_headers):
+    resp = client.post(
+        BULK_URL, headers=super_admin_headers, json={"create": [_template("bulk_bad", subject_template=None)]}
+    )
+    assert resp.status_code == 422
+
+
+def test_bulk_rejects_empty_request(client, super_admin_headers):
+    assert client.post(BULK_URL, headers=super_admin_headers, json={}).status_code == 422
+
+
+def test_bulk_rejects_duplicate_names(client, super_admin_headers):
+    existing = client.post(BULK_URL, headers=super_admin_headers, json={"create": [_template("bulk_taken")]})
+    assert existing.status_code == 200, existing.text
+    other = client.post(BULK_URL, headers=super_admin_headers, json={"create": [_template("bulk_other")]})
+    other_id = other.json()["results"][0]["id"]
+
+    resp = client.post(
+        BULK_URL,
+        headers=super_admin_headers,
+        json={
+            "create": [
+                _template("bulk_twice"),
+                _template("bulk_twice"),
+                _template("bulk_taken"),
+                _template("bulk_taken", template_type="slack", subject_template=None),
+            ],
+            "update": [{"id": other_id, "name": "bulk_taken"}],
+        },
+    )
+    assert resp.status_code == 400
+    errors = resp.json()["detail"]["errors"]
+    assert [(e["op"], e["index"]) for e in errors] == [("create", 1), ("create", 2), ("update", 0)]
+    assert "appears more than once" in errors[0]["detail"]
+    assert "already exists" in errors[1]["detail"]
+
+    names = [t["name"] for t in client.get("/api/v1/admin/cms/notification-templates", headers=super_admin_headers).json()]
+    assert "bulk_twice" not in names and names.count("bulk_taken") == 1
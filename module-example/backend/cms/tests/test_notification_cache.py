@@ -0,0 +1,57 @@
+"""Resolved notification template cache used by dispatch."""
+from __future__ import annotations
+
+from sqlmodel import Session
+
+from app.cms.cache import notification_template_cache
+from app.cms.notification_cache import NotificationTemplateResolver
+
+
+def _create(client, headers, **overrides):
+    payload = {
+        "name": "job_alert",
+        "template_type": "email",
+        "category": "alerts",
+        "subject_template": "New jobs",
+        "body_template": "v1",
+        "variables": [],
+        **overrides,
+    }
+    resp = client.post("/api/v1/admin/cms/notification-templates", headers=headers, json=payload)
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def test_resolver_serves_lookups_from_one_snapshot(client, super_admin_headers, db_session: Session):
+    _create(client, super_admin_headers)
+    _create(client, super_admin_headers, template_type="slack", subject_template=None)
+    _create(client, super_admin_headers, name="inactive_alert", is_active=False)
+
+    misses_before = notification_template_cache.snapshot_stats()["misses"]
+    resolver = NotificationTemplateResolver(db_session)
+    assert resolver.get("job_alert", "email").body_template == "v1"
+    assert resolver.get("job_alert", "slack") is not None
+    assert resolver.get("inactive_alert", "email") is None
+    assert {t.template_type for t in resolver.for_category("alerts")} == {"email", "slack"}
+    assert [t.template_type for t in resolver.for_category("alerts", "slack")] == ["slack"]
+
+    # Every lookup above after the first was served from the cached snapshot
+    assert notification_template_cache.snapshot_stats()["misses"] - misses_before == 1
+
+
+def test_admin_writes_invalidate_snapshot(client, super_admin_headers, db_session: Session):
+    created = _create(client, super_admin_headers)
+    resolver = NotificationTemplateResolver(db_session)
+    assert resolver.get("job_alert", "email").body_template == "v1"
+
+    resp = client.put(
+        f"/api/v1/admin/cms/notification-templates/{created['id']}",
+        headers=super_admin_headers,
+        json={"body_template": "v2"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert len(notification_template_cache) == 0
+    assert resolver.get("job_alert", "email").body_template == "v2"
+
+    client.delete(f"/api/v1/admin/cms/notification-templates/{created['id']}", headers=super_admin_headers)
+    assert resolver.get("job_alert", "email") is None
@@ -0,0 +1,84 @@
+"""Typed notification template admin routes."""
+from __future__ import annotations
+
+URL = "/api/v1/admin/cms/notification-templates"
+
+
+def test_create_validates_payload(client, super_admin_headers):
+    missing_subject = {"name": "typed", "template_type": "email", "category": "alerts", "body_template": "b"}
+    assert client.post(URL, headers=super_admin_headers, json=missing_subject).status_code == 422
+    bad_type = {**missing_subject, "template_type": "sms", "subject_template": "s"}
+    assert client.post(URL, headers=super_admin_headers, json=bad_type).status_code == 422
+
+
+def test_update_rejects_empty_fields(client, super_admin_headers):
+    created = client.post(
+        URL,
+        headers=super_admin_headers,
+        json={"name": "typed_empty", "template_type": "slack", "category": "alerts", "body_template": "hi"},
+    ).json()
+    for field in ("name", "category", "body_template"):
+        resp = client.put(f"{URL}/{created['id']}", headers=super_admin_headers, json={field: ""})
+        assert resp.status_code == 422, field
+    bulk = client.post(f"{URL}/bulk", headers=super_admin_headers, json={"update": [{"id": created["id"], "name": ""}]})
+    assert bulk.status_code == 422
+    assert client.get(f"{URL}/{created['id']}", headers=super_admin_headers).json()["name"] == "typed_empty"
+
+
+def test_crud_round_trip_uses_response_schema(client, super_admin_headers):
+    created = client.post(
+        URL,
+        headers=super_admin_headers,
+        json={"name": "typed", "template_type": "slack", "category": "alerts", "body_template": "hi"},
+    )
+    assert created.status_code == 201, created.text
+    body = created.json()
+    assert body["is_active"] is True and body["is_default"] is False
+
+    listed = client.get(URL, headers=super_admin_headers, params={"template_type": "slack"}).json()
+    assert next(t for t in listed if t["id"] == body["id"]) == body
+
+    switched = client.put(f"{URL}/{body['id']}", headers=super_admin_headers, json={"template_type": "email"})
+    assert switched.status_code == 400
+
+    updated = client.put(f"{URL}/{body['id']}", headers=super_admin_headers, json={"body_template": "hello"})
+    assert updated.status_code == 200
+    assert updated.json() == {**body, "body_template": "hello"}
+
+
+class TestNotificationTemplateListing:
+    def _seed(self, client, headers):
+        items = [
+            {"name": f"list_{i}", "template_type": "slack", "category": "digest", "body_template": "x" * (i + 1),
+             "is_active": i != 1, "is_default": i == 2}
+            for i in range(3)
+        ]
+        resp = client.post(f"{URL}/bulk", headers=headers, json={"create": items})
+        assert resp.status_code == 200, resp.text
+        return [r["id"] for r in resp.json()["results"]]
+
+    def test_filters_and_keyset_paging(self, client, super_admin_headers):
+        ids = self._seed(client, super_admin_headers)
+        params = {"category": "digest", "limit": 2}
+        first = client.get(URL, headers=super_admin_headers, params=params)
+        assert [t["id"] for t in first.json()] == ids[:2]
+        cursor = first.headers["x-next-cursor"]
+        second = client.get(URL, headers=super_admin_headers, params={**params, "after_id": cursor})
+        assert [t["id"] for t in second.json()] == ids[2:]
+        assert "x-next-cursor" not in second.headers
+
+        active = client.get(URL, headers=super_admin_headers, params={"category": "digest", "is_active": "false"})
+        assert [t["id"] for t in active.json()] == [ids[1]]
+        default = client.get(URL, headers=super_admin_headers, params={"category": "digest", "is_default": "true"})
+        assert [t["id"] for t in default.json()] == [ids[2]]
+
+    def test_summary_omits_bodies(self, client, super_admin_headers):
+        ids = self._seed(client, super_admin_headers)
+        rows = client.get(f"{URL}/summary", headers=super_admin_headers, params={"category": "digest"}).json()
+        assert [r["id"] for r in rows] == ids
+        assert all("body_template" not in r for r in rows)
+        assert [r["body_length"] for r in rows] == [1, 2, 3]
+
+        full = client.get(f"{URL}/{ids[2]}", headers=super_admin_headers).json()
+        assert full["body_template"] == "xxx"
+        assert client.get(f"{URL}/999999", headers=super_admin_headers).status_code == 404
@@ -0,0 +1,101 @@
+"""Placeholder extraction on write and the variable usage lookup."""
+from __future__ import annotations
+
+from sqlmodel import Session
+
+from app.cms.models import ServiceEmailTemplate
+from app.cms.rendering import extract_placeholders
+
+
+def test_extract_placeholders_is_sorted_and_unique():
+    assert extract_placeholders("Hi {user_name}", "{{ app_url }} / {{user_name}}", None) == ["app_url", "user_name"]
+    assert extract_placeholders("a { color: red }") == []
+
+
+def test_unknown_template_variable_is_rejected(client, super_admin_headers):
+    resp = client.post(
+        "/api/v1/admin/cms/email-templates",
+        headers=super_admin_headers,
+        json={
+            "name": "ph_unknown",
+            "category": "generic",
+            "subject_template": "Hi {user_name}",
+            "body_html": "Open {{ app_url }}",
+            "variables": ["user_name"],
+        },
+    )
+    assert resp.status_code == 400
+    assert "app_url" in resp.json()["detail"]
+
+
+def test_placeholders_are_stored_and_queryable(client, super_admin_headers):
+    tpl = client.post(
+        "/api/v1/admin/cms/email-templates",
+        headers=super_admin_headers,
+        json={
+            "name": "ph_tpl",
+            "category": "generic",
+            "subject_template": "Hi {ph_user}",
+            "body_html": "Open {{ ph_link }}",
+            "variables": ["ph_user", "ph_link", "ph_unused"],
+        },
+    )
+    assert tpl.status_code == 201, tpl.text
+    assert tpl.json()["placeholders"] == ["ph_link", "ph_user"]
+
+    block = client.post(
+        "/api/v1/admin/cms/blocks",
+        headers=super_admin_headers,
+        json={"key": "ph_block", "title": "Block", "html_content": "Go to {ph_link}", "variables": ["ph_link"]},
+    )
+    assert block.status_code == 201, block.text
+    assert block.json()["placeholders"] == ["ph_link"]
+
+    usages = client.get("/api/v1/admin/cms/variables/ph_link/usages", headers=super_admin_headers).json()
+    assert [t["name"] for t in usages["email_templates"]] == ["ph_tpl"]
+    assert [b["key"] for b in usages["blocks"]] == ["ph_block"]
+
+    # Dropping the placeholder from the body drops it from the index
+    resp = client.put(
+        f"/api/v1/admin/cms/email-templates/{tpl.json()['id']}",
+        headers=super_admin_headers,
+        json={"body_html": "No link"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["placeholders"] == ["ph_user"]
+    usages = client.get("/api/v1/admin/cms/variables/ph_link/usages", headers=super_admin_headers).json()
+    assert usages["email_templates"] == []
+    assert client.get("/api/v1/admin/cms/variables/ph_unused/usages", headers=super_admin_headers).json() == {
+        "variable": "ph_unused",
+        "email_templates": [],
+        "blocks": [],
+    }
+
+
+def test_reindex_backfills_rows_written_before_the_column(client, super_admin_headers, db_session: Session):
+    created = client.post(
+        "/api/v1/admin/cms/email-templates",
+        headers=super_admin_headers,
+        json={
+            "name": "ph_legacy",
+            "category": "generic",
+            "subject_template": "Hi {legacy_user}",
+            "body_html": "Body",
+            "variables": ["legacy_user"],
+        },
+    ).json()
+    # Simulate a row that predates the placeholders column
+    row = db_session.get(ServiceEmailTemplate, created["id"])
+    row.placeholders = []
+    db_session.add(row)
+    db_session.commit()
+    usages_url = "/api/v1/admin/cms/variables/legacy_user/usages"
+    assert client.get(usages_url, headers=super_admin_headers).json()["email_templates"] == []
+
+    resp = client.post("/api/v1/admin/cms/variables/reindex", headers=super_admin_headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["email_templates"] == 1
+    assert [t["name"] for t in client.get(usages_url, headers=super_admin_headers).json()["email_templates"]] == ["ph_legacy"]
+
+    again = client.post("/api/v1/admin/cms/variables/reindex", headers=super_admin_headers).json()
+    assert again == {"blocks": 0, "email_templates": 0}
@@ -38,7 +38,7 @@ class TestPublicCMSBlocks:
                 "key": "public_filter_demo",
                 "category": "product_tour",
                 "title": "Filter demo",
-                "html_content": "{}",
+                "html_content": '{"steps": [{"id": "intro", "text": "Hi"}]}',
             },
         )
         assert create.status_code == 201, create.text
@@ -50,3 +50,55 @@ class TestPublicCMSBlocks:
         assert right_category.status_code == 200, right_category.text
         data = right_category.json()
         assert data["category"] == "product_tour"
+
+
+class TestPublicCMSConditionalGet:
+    def test_etag_round_trip_returns_304(self, client, super_admin_headers):
+        create = client.post(
+            "/api/v1/admin/cms/blocks",
+            headers=super_admin_headers,
+            json={"key": "etag_demo", "title": "ETag demo", "html_content": "<p>v1</p>"},
+        )
+        assert create.status_code == 201, create.text
+        bid = create.json()["id"]
+
+        first = client.get("/api/v1/cms/blocks/etag_demo")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"')
+        assert "max-age" in first.headers["cache-control"]
+
+        cached = client.get("/api/v1/cms/blocks/etag_demo", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        client.put(f"/api/v1/admin/cms/blocks/{bid}", headers=super_admin_headers, json={"html_content": "<p>v2</p>"})
+        changed = client.get("/api/v1/cms/blocks/etag_demo", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+
+class TestPublicCMSBatchLookup:
+    def test_batch_lookup_returns_keyed_map_and_missing(self, client, super_admin_headers):
+        for key in ("batch_a", "batch_b"):
+            resp = client.post(
+                "/api/v1/admin/cms/blocks",
+                headers=super_admin_headers,
+                json={"key": key, "title": f"Title {key}", "html_content": f"body {key}"},
+            )
+            assert resp.status_code == 201, resp.text
+
+        resp = client.get("/api/v1/cms/blocks?keys=batch_a,batch_b,batch_missing")
+        assert resp.status_code == 200, resp.text
+        data = resp.json()
+        assert set(data["blocks"]) == {"batch_a", "batch_b"}
+        assert data["blocks"]["batch_b"]["html_content"] == "body batch_b"
+        assert data["missing"] == ["batch_missing"]
+
+    def test_batch_lookup_respects_category_and_limits(self, client):
+        resp = client.get("/api/v1/cms/blocks?keys=batch_a&category=product_tour")
+        assert resp.status_code == 200
+        assert resp.json()["blocks"] == {}
+
+        too_many = ",".join(f"k{i}" for i in range(51))
+        assert client.get(f"/api/v1/cms/blocks?keys={too_many}").status_code == 400
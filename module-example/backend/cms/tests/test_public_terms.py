@@ -21,3 +21,50 @@ def test_public_terms_endpoint(client, db_session: Session):
     data = resp.json()
     assert "title" in data
     assert "content_md" in data and isinstance(data["content_md"], str)
+
+
+TERMS_URL = "/api/v1/cms/terms-of-service"
+
+
+def test_missing_terms_are_healed_from_seed(client, super_admin_headers):
+    from app.cms.service import _terms_fallback_block
+
+    resp = client.get(TERMS_URL)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["content_md"] == _terms_fallback_block().html_content
+    keys = [b["key"] for b in client.get("/api/v1/admin/cms/blocks", headers=super_admin_headers).json()]
+    assert "terms_of_service" in keys
+
+
+def test_heal_never_overwrites_terms_stored_behind_a_stale_cache(client, db_session: Session, monkeypatch):
+    from app.cms.cache import public_block_cache
+    from app.cms.models import ServiceContentBlock
+    from app.cms.service import ContentBlockService
+
+    # This worker cached "missing"; another worker then stored an edited ToS
+    public_block_cache.set(("terms_of_service", None), None)
+    db_session.add(ServiceContentBlock(key="terms_of_service", title="Terms", html_content="# Edited terms", variables=[]))
+    db_session.commit()
+
+    def no_seeding(self):
+        raise AssertionError("heal must not re-seed an existing ToS")
+
+    monkeypatch.setattr(ContentBlockService, "ensure_terms_default", no_seeding)
+    assert client.get(TERMS_URL).json()["content_md"] == "# Edited terms"
+    # The stale negative entry is gone, so the next read is a plain cache fill
+    assert public_block_cache.get(("terms_of_service", None), "dropped") == "dropped"
+    assert client.get(TERMS_URL).json()["content_md"] == "# Edited terms"
+    assert public_block_cache.get(("terms_of_service", None)).html_content == "# Edited terms"
+
+
+def test_terms_fall_back_to_seed_when_the_heal_times_out(client, monkeypatch):
+    from app.cms import service as cms_service
+
+    class _SlowFlight:
+        def do(self, key, fn, *, timeout=None):
+            raise TimeoutError(key)
+
+    monkeypatch.setattr(cms_service, "_terms_heal_flight", _SlowFlight())
+    resp = client.get(TERMS_URL)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["content_md"] == cms_service._terms_fallback_block().html_content
@@ -0,0 +1,92 @@
+"""Precompiled email template rendering."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from app.cms import rendering
+from app.cms.cache import compiled_template_cache
+from app.cms.models import ServiceEmailTemplate
+from app.cms.rendering import TemplateRenderError, compile_template, shutdown_render_pool
+from app.cms.service import EmailTemplateService
+
+
+def test_compile_handles_both_placeholder_styles():
+    compiled = compile_template("Hi {user_name}, {{ count }} new / {{count}}")
+    assert compiled.names == ("user_name", "count", "count")
+    assert compiled.render({"user_name": "Ada", "count": 3}) == "Hi Ada, 3 new / 3"
+
+
+def test_compile_leaves_css_and_undeclared_tokens_verbatim():
+    source = "a { color: red } {known} {other}"
+    compiled = compile_template(source, allowed=["known"])
+    assert compiled.placeholders == {"known"}
+    assert compiled.render({"known": "K"}) == "a { color: red } K {other}"
+
+
+def test_render_rejects_missing_variables():
+    with pytest.raises(TemplateRenderError):
+        compile_template("{{ a }} {b}").render({"a": 1})
+
+
+def test_service_render_uses_cache_keyed_by_updated_at():
+    tpl = ServiceEmailTemplate(
+        id=42,
+        name="digest",
+        category="daily_digest",
+        subject_template="{count} new",
+        body_html="Hello {{ user_name }}",
+        variables=["count", "user_name"],
+        updated_at=datetime(2025, 1, 1),
+    )
+    compiled_template_cache.clear()
+    assert EmailTemplateService.render(tpl, {"count": 2, "user_name": "Bo"}) == ("2 new", "Hello Bo")
+    EmailTemplateService.render(tpl, {"count": 5, "user_name": "Cy"})
+    assert len(compiled_template_cache) == 2  # subject + body, compiled once
+
+    tpl.body_html = "Bye {{ user_name }}"
+    tpl.updated_at = datetime(2025, 1, 2)
+    assert EmailTemplateService.render(tpl, {"count": 1, "user_name": "Bo"})[1] == "Bye Bo"
+
+
+def test_render_many_bakes_shared_values_and_keeps_order(monkeypatch):
+    # Keep the spawned pool small; it is created on first use with this size
+    shutdown_render_pool()
+    monkeypatch.setattr(rendering, "RENDER_POOL_WORKERS", 2)
+    tpl = ServiceEmailTemplate(
+        name="daily_digest",
+        category="daily_digest",
+        subject_template="{count} new",
+        body_html="Hi {{ user_name }} - {{ assignments_html }} - {{ app_url }}",
+        variables=["count", "user_name", "assignments_html", "app_url"],
+    )
+    contexts = ({"count": i, "user_name": f"u{i}", "assignments_html": f"a{i}"} for i in range(1200))
+    try:
+        out = list(EmailTemplateService.render_many(tpl, contexts, shared={"app_url": "https://app"}))
+    finally:
+        shutdown_render_pool()
+    assert len(out) == 1200
+    assert out[0] == ("0 new", "Hi u0 - a0 - https://app")
+    assert out[1199] == ("1199 new", "Hi u1199 - a1199 - https://app")
+
+
+def test_memoized_email_templates_render_once_per_context(monkeypatch):
+    from app.cms.rendering import MemoizedEmailTemplates
+
+    calls = []
+
+    class FakeTemplates:
+        notification_style = "style"
+
+        def render_invitation(self, ctx):
+            calls.append(ctx)
+            return f"invite {ctx['user_name']}"
+
+    MemoizedEmailTemplates.clear()
+    monkeypatch.setattr(MemoizedEmailTemplates, "_email_templates", lambda self: FakeTemplates())
+    ctx = {"user_name": "{user_name}"}
+    assert MemoizedEmailTemplates(db=None).render_invitation(ctx) == "invite {user_name}"
+    assert MemoizedEmailTemplates(db=None).render_invitation(ctx) == "invite {user_name}"
+    assert len(calls) == 1
+    MemoizedEmailTemplates.clear()
@@ -1,21 +1,24 @@
 """CMS seeds: ensure file-backed defaults exist and load."""
 from __future__ import annotations
 
+import os
+
+from app.cms.seeds import loader
 from app.cms.seeds.loader import (
-    DEFAULT_CONTENT_BLOCKS,
-    DEFAULT_NOTIFICATION_TEMPLATES,
+    default_content_blocks,
+    default_notification_templates,
     render_email_html,
 )
 
 
 def test_default_content_blocks_loaded_from_disk():
-    keys = {b["key"] for b in DEFAULT_CONTENT_BLOCKS}
+    keys = {b["key"] for b in default_content_blocks()}
     assert "terms_of_service" in keys
     assert "signal_scoring_tour" in keys
 
 
 def test_default_notification_templates_loaded_from_disk():
-    keys = {(d.get("name"), d.get("template_type")) for d in DEFAULT_NOTIFICATION_TEMPLATES}
+    keys = {(d.get("name"), d.get("template_type")) for d in default_notification_templates()}
     assert ("daily_digest_email", "email") in keys
     assert ("high_value_slack", "slack") in keys
 
@@ -26,3 +29,23 @@ def test_render_email_html_injects_style():
     assert "seed-style" in html
     assert "__STYLE__" not in html
 
+
+def test_defaults_are_cached_until_a_seed_file_changes(tmp_path, monkeypatch):
+    (tmp_path / "notification_templates").mkdir()
+    seed = tmp_path / "notification_templates" / "defaults.json"
+    seed.write_text('[{"name": "a", "template_type": "email"}]', encoding="utf-8")
+    monkeypatch.setattr(loader, "_TEMPLATES_DIR", tmp_path)
+    monkeypatch.setattr(loader, "_derived_cache", {})
+    monkeypatch.setattr(loader, "_file_cache", {})
+
+    first = default_notification_templates()
+    assert default_notification_templates() is first
+
+    seed.write_text('[{"name": "b", "template_type": "slack"}, {"name": "c", "template_type": "email"}]', encoding="utf-8")
+    stat = seed.stat()
+    os.utime(seed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert [d["name"] for d in default_notification_templates()] == ["b", "c"]
+
+
+def test_legacy_constants_resolve_lazily():
+    assert loader.DEFAULT_CONTENT_BLOCKS is default_content_blocks()
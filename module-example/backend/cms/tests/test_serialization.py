@@ -0,0 +1,54 @@
+"""Fast-path list serialization matches the response schemas."""
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from app.cms.models import ServiceEmailTemplate
+from app.cms.schemas import ContentBlockSummaryResponse, EmailTemplateResponse
+from app.cms.serialization import rows_response
+
+
+def test_rows_response_matches_pydantic_output():
+    tpl = ServiceEmailTemplate(
+        id=7, name="welcome", category="generic", subject_template="Hi {name}", body_html="Body", variables=["name"]
+    )
+    resp = rows_response([tpl], EmailTemplateResponse, headers={"X-Next-Cursor": "7"})
+    assert resp.headers["x-next-cursor"] == "7"
+    assert json.loads(resp.body) == [EmailTemplateResponse.model_validate(tpl).model_dump(mode="json")]
+
+
+def test_rows_response_accepts_mappings_and_datetimes():
+    row = {
+        "id": 1,
+        "key": "k",
+        "category": "content",
+        "title": "T",
+        "description": None,
+        "variables": [],
+        "updated_at": datetime(2025, 1, 2, 3, 4, 5),
+        "revision": 3,
+        "content_length": 10,
+        "html_content": "not part of the schema",
+    }
+    body = json.loads(rows_response([row], ContentBlockSummaryResponse).body)
+    assert body == [ContentBlockSummaryResponse.model_validate(row).model_dump(mode="json")]
+
+
+def test_block_listing_matches_single_block_endpoint(client, super_admin_headers):
+    created = client.post(
+        "/api/v1/admin/cms/blocks",
+        headers=super_admin_headers,
+        json={"key": "fast_list", "title": "Fast list", "html_content": "body", "variables": ["a"]},
+    ).json()
+    listed = client.get("/api/v1/admin/cms/blocks", headers=super_admin_headers).json()
+    assert next(b for b in listed if b["id"] == created["id"]) == created
+
+
+def test_null_columns_fall_back_to_schema_defaults():
+    row = {"id": 1, "key": "k", "category": "content", "title": "T", "variables": None, "revision": None}
+    body = json.loads(rows_response([row], ContentBlockSummaryResponse).body)
+    assert body[0]["variables"] == []
+    assert body[0]["revision"] == 0
+    assert body[0]["content_length"] == 0
+    assert body[0]["description"] is None
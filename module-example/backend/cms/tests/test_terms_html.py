@@ -0,0 +1,45 @@
+"""Pre-rendered terms of service HTML (content_html, ?format=html)."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("markdown")
+pytest.importorskip("nh3")
+
+from app.cms.markup import render_markdown
+
+
+def test_render_markdown_sanitizes_output():
+    html = render_markdown("# Terms\n\n**Bold** [link](javascript:alert(1))")
+    assert "strong" in html
+    assert "javascript:" not in html
+    assert render_markdown("   ") is None
+
+
+def test_terms_served_as_prerendered_html(client, super_admin_headers):
+    seeded = client.post("/api/v1/admin/cms/blocks/load-terms-default", headers=super_admin_headers)
+    assert seeded.status_code == 200, seeded.text
+    assert seeded.json()["content_html"]
+
+    data = client.get("/api/v1/cms/terms-of-service").json()
+    assert data["content_md"] and data["content_html"] == seeded.json()["content_html"]
+
+    resp = client.get("/api/v1/cms/terms-of-service?format=html")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/html")
+    assert resp.text == data["content_html"]
+    assert client.get(
+        "/api/v1/cms/terms-of-service?format=html", headers={"If-None-Match": resp.headers["etag"]}
+    ).status_code == 304
+
+
+def test_block_update_rerenders_terms_html(client, super_admin_headers):
+    block = client.post("/api/v1/admin/cms/blocks/load-terms-default", headers=super_admin_headers).json()
+    updated = client.put(
+        f"/api/v1/admin/cms/blocks/{block['id']}",
+        headers=super_admin_headers,
+        json={"html_content": "Updated *terms*"},
+    )
+    assert updated.status_code == 200, updated.text
+    assert "em" in updated.json()["content_html"]
+    assert "Updated" in client.get("/api/v1/cms/terms-of-service?format=html").text
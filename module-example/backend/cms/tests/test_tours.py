@@ -0,0 +1,72 @@
+"""Product tour validation, canonical storage and the public tour endpoint."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.cms.tours import TourValidationError, canonicalize_tour
+
+TOUR = {
+    "key": "jobs_tour",
+    "title": "Jobs walkthrough",
+    "useModalOverlay": True,
+    "steps": [
+        {
+            "id": "intro",
+            "title": "Find relevant jobs fast",
+            "text": "This tour shows filters, cards, and actions you use daily.",
+            "attachTo": {"element": "[data-tour-id='jobs-header']", "on": "bottom"},
+            "buttons": [{"type": "cancel", "text": "Skip"}, {"type": "next", "text": "Next"}],
+        }
+    ],
+}
+
+
+def test_canonicalize_tour_minifies_and_validates():
+    canonical = canonicalize_tour(json.dumps(TOUR, indent=2))
+    assert json.loads(canonical) == TOUR
+    assert canonical == json.dumps(TOUR, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+    with pytest.raises(TourValidationError):
+        canonicalize_tour("{not json")
+    with pytest.raises(TourValidationError, match="steps"):
+        canonicalize_tour(json.dumps({"title": "No steps", "steps": []}))
+    bad_button = {**TOUR, "steps": [{**TOUR["steps"][0], "buttons": [{"type": "jump", "text": "?"}]}]}
+    with pytest.raises(TourValidationError, match="type"):
+        canonicalize_tour(json.dumps(bad_button))
+
+
+class TestProductTourBlocks:
+    def _create(self, client, headers, content: str):
+        return client.post(
+            "/api/v1/admin/cms/blocks",
+            headers=headers,
+            json={"key": "jobs_tour", "category": "product_tour", "title": "Jobs tour", "html_content": content},
+        )
+
+    def test_invalid_tour_is_rejected(self, client, super_admin_headers):
+        resp = self._create(client, super_admin_headers, json.dumps({"steps": [{"id": "a"}]}))
+        assert resp.status_code == 400
+        assert "Invalid product tour" in resp.json()["detail"]
+
+    def test_tour_is_stored_minified_and_served_structured(self, client, super_admin_headers):
+        created = self._create(client, super_admin_headers, json.dumps(TOUR, indent=4))
+        assert created.status_code == 201, created.text
+        stored = created.json()["html_content"]
+        assert stored == canonicalize_tour(json.dumps(TOUR))
+
+        resp = client.get("/api/v1/cms/tours/jobs_tour", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.json() == TOUR
+        assert resp.headers["vary"] == "Accept-Encoding"
+
+        update = client.put(
+            f"/api/v1/admin/cms/blocks/{created.json()['id']}",
+            headers=super_admin_headers,
+            json={"html_content": "[]"},
+        )
+        assert update.status_code == 400
+
+    def test_unknown_tour_returns_404(self, client):
+        assert client.get("/api/v1/cms/tours/nope").status_code == 404
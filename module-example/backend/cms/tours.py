@@ -0,0 +1,91 @@
+"""Shepherd.js product tour definitions stored in `product_tour` content blocks.
+
+Tours are validated when written and stored in a minified canonical JSON form
+(see TOURS.md for the format), so the public tour endpoint can serve the stored
+bytes as-is.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+PRODUCT_TOUR_CATEGORY = "product_tour"
+
+BUTTON_TYPES = frozenset({"next", "back", "cancel", "finish"})
+ATTACH_PLACEMENTS = frozenset(
+    f"{side}{suffix}" for side in ("auto", "top", "bottom", "left", "right") for suffix in ("", "-start", "-end")
+)
+
+
+class TourValidationError(ValueError):
+    """Raised when a product tour definition does not match the Shepherd schema."""
+
+
+def _expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise TourValidationError(message)
+
+
+def _optional_str(obj: Dict[str, Any], field: str, where: str) -> None:
+    if field in obj:
+        _expect(isinstance(obj[field], str), f"{where}.{field} must be a string")
+
+
+def _validate_step(step: Any, where: str, seen_ids: set) -> None:
+    _expect(isinstance(step, dict), f"{where} must be an object")
+    step_id = step.get("id")
+    _expect(isinstance(step_id, str) and step_id.strip() != "", f"{where}.id is required")
+    _expect(step_id not in seen_ids, f"{where}.id '{step_id}' is duplicated")
+    seen_ids.add(step_id)
+    _expect(isinstance(step.get("text"), str) and step["text"].strip() != "", f"{where}.text is required")
+    _optional_str(step, "title", where)
+
+    if "attachTo" in step:
+        attach = step["attachTo"]
+        _expect(isinstance(attach, dict), f"{where}.attachTo must be an object")
+        _expect(
+            isinstance(attach.get("element"), str) and attach["element"].strip() != "",
+            f"{where}.attachTo.element is required",
+        )
+        _expect(
+            attach.get("on", "auto") in ATTACH_PLACEMENTS,
+            f"{where}.attachTo.on must be one of: {', '.join(sorted(ATTACH_PLACEMENTS))}",
+        )
+
+    if "buttons" in step:
+        buttons = step["buttons"]
+        _expect(isinstance(buttons, list), f"{where}.buttons must be a list")
+        for j, button in enumerate(buttons):
+            bwhere = f"{where}.buttons[{j}]"
+            _expect(isinstance(button, dict), f"{bwhere} must be an object")
+            _expect(
+                button.get("type") in BUTTON_TYPES,
+                f"{bwhere}.type must be one of: {', '.join(sorted(BUTTON_TYPES))}",
+            )
+            _expect(isinstance(button.get("text"), str), f"{bwhere}.text must be a string")
+
+
+def validate_tour(tour: Any) -> None:
+    """Check the parts of a Shepherd config the frontend relies on."""
+    _expect(isinstance(tour, dict), "tour must be a JSON object")
+    _optional_str(tour, "key", "tour")
+    _optional_str(tour, "title", "tour")
+    if "useModalOverlay" in tour:
+        _expect(isinstance(tour["useModalOverlay"], bool), "tour.useModalOverlay must be a boolean")
+    if "defaultStepOptions" in tour:
+        _expect(isinstance(tour["defaultStepOptions"], dict), "tour.defaultStepOptions must be an object")
+    steps: List[Any] = tour.get("steps")  # type: ignore[assignment]
+    _expect(isinstance(steps, list) and len(steps) > 0, "tour.steps must be a non-empty list")
+    seen_ids: set = set()
+    for i, step in enumerate(steps):
+        _validate_step(step, f"steps[{i}]", seen_ids)
+
+
+def canonicalize_tour(raw: str) -> str:
+    """Parse, validate and return the minified canonical JSON for a tour definition."""
+    try:
+        tour = json.loads(raw)
+    except (TypeError, ValueError) as exc:
+        raise TourValidationError(f"tour is not valid JSON: {exc}") from exc
+    validate_tour(tour)
+    return json.dumps(tour, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
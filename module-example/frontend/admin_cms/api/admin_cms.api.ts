@@ -1,5 +1,16 @@
 import { apiClient } from '@/shared/api/client'
 
+// One keyset page of a listing; `nextCursor` comes from the X-Next-Cursor header (absent on the last page)
+export interface CursorPage<T> {
+  items: T[]
+  nextCursor?: number
+}
+
+function cursorPage<T>(items: T[], headers: Record<string, any>): CursorPage<T> {
+  const next = headers['x-next-cursor']
+  return { items, nextCursor: next ? Number(next) : undefined }
+}
+
 // ---------- Content Blocks ----------
 export interface ContentBlockDTO {
   id: number
@@ -9,6 +20,7 @@ export interface ContentBlockDTO {
   html_content: string
   description?: string
   variables: string[]
+  placeholders?: string[]
 }
 
 export async function listContentBlocks(params?: { category?: string }) {
@@ -16,6 +28,27 @@ export async function listContentBlocks(params?: { category?: string }) {
   return data
 }
 
+export interface ContentBlockSummaryDTO {
+  id: number
+  key: string
+  category: string
+  title: string
+  description?: string
+  variables: string[]
+  updated_at?: string
+  content_length: number
+}
+
+export async function listContentBlockSummaries(params?: { category?: string; after_id?: number; limit?: number }) {
+  const { data, headers } = await apiClient.get<ContentBlockSummaryDTO[]>('/admin/cms/blocks/summary', { params })
+  return cursorPage(data, headers)
+}
+
+export async function getContentBlock(id: number) {
+  const { data } = await apiClient.get<ContentBlockDTO>(`/admin/cms/blocks/${id}`)
+  return data
+}
+
 export async function createContentBlock(payload: Omit<ContentBlockDTO, 'id'>) {
   const { data } = await apiClient.post<ContentBlockDTO>('/admin/cms/blocks', payload)
   return data
@@ -48,10 +81,11 @@ export interface EmailTemplateDTO {
   subject_template: string
   body_html: string
   variables?: string[]
+  placeholders?: string[]
   is_active: boolean
 }
 
-export async function listEmailTemplates(params?: { skip?: number; limit?: number; search?: string }) {
+export async function listEmailTemplates(params?: { skip?: number; limit?: number; search?: string; search_mode?: 'name' | 'full'; after_id?: number; include_total?: boolean }) {
   const { data } = await apiClient.get<EmailTemplateDTO[]>('/admin/cms/email-templates', { params })
   return data
 }
@@ -75,6 +109,17 @@ export async function getTemplateVariables(): Promise<Record<string, string[]>>
   return data
 }
 
+export interface VariableUsagesDTO {
+  variable: string
+  email_templates: { id: number; name: string; category: string }[]
+  blocks: { id: number; key: string; category: string }[]
+}
+
+export async function getVariableUsages(name: string) {
+  const { data } = await apiClient.get<VariableUsagesDTO>(`/admin/cms/variables/${encodeURIComponent(name)}/usages`)
+  return data
+}
+
 export async function importInviteDefaults() {
   const { data } = await apiClient.post<EmailTemplateDTO>('/admin/cms/email-templates/load-defaults')
   return data
@@ -98,11 +143,35 @@ export interface NotificationTemplateDTO {
   is_default: boolean
 }
 
-export async function listNotificationTemplates(params?: { template_type?: 'email' | 'slack' }) {
+export interface NotificationTemplateListParams {
+  template_type?: 'email' | 'slack'
+  category?: string
+  is_active?: boolean
+  is_default?: boolean
+  after_id?: number
+  limit?: number
+}
+
+export async function listNotificationTemplates(params?: NotificationTemplateListParams) {
   const { data } = await apiClient.get<NotificationTemplateDTO[]>('/admin/cms/notification-templates', { params })
   return data
 }
 
+export interface NotificationTemplateSummaryDTO extends Omit<NotificationTemplateDTO, 'body_template'> {
+  body_length: number
+}
+
+// Table listing without bodies, one keyset page at a time
+export async function listNotificationTemplateSummaries(params?: NotificationTemplateListParams) {
+  const { data, headers } = await apiClient.get<NotificationTemplateSummaryDTO[]>('/admin/cms/notification-templates/summary', { params })
+  return cursorPage(data, headers)
+}
+
+export async function getNotificationTemplate(id: number) {
+  const { data } = await apiClient.get<NotificationTemplateDTO>(`/admin/cms/notification-templates/${id}`)
+  return data
+}
+
 export async function createNotificationTemplate(payload: Omit<NotificationTemplateDTO, 'id'>) {
   const { data } = await apiClient.post<NotificationTemplateDTO>('/admin/cms/notification-templates', payload)
   return data
@@ -121,3 +190,22 @@ export async function importAllNotificationDefaults() {
   const { data } = await apiClient.post<NotificationTemplateDTO[]>('/admin/cms/notification-templates/import-missing')
   return data
 }
+
+export interface NotificationTemplateBulkRequest {
+  create?: Omit<NotificationTemplateDTO, 'id'>[]
+  update?: (Partial<Omit<NotificationTemplateDTO, 'id'>> & { id: number })[]
+  delete?: number[]
+}
+
+export interface NotificationTemplateBulkResult {
+  op: 'create' | 'update' | 'delete'
+  index: number
+  id: number
+  template: NotificationTemplateDTO | null
+}
+
+// All-or-nothing: a 400 carries `detail.errors` as [{ op, index, detail }]
+export async function bulkNotificationTemplates(payload: NotificationTemplateBulkRequest) {
+  const { data } = await apiClient.post<{ results: NotificationTemplateBulkResult[] }>('/admin/cms/notification-templates/bulk', payload)
+  return data.results
+}
@@ -1,7 +1,9 @@
 import React from 'react'
 import { Button, Group, LoadingOverlay, Modal, Paper, Table, Text, TextInput, Textarea, Badge, Select } from '@mantine/core'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { createContentBlock, deleteContentBlock, listContentBlocks, updateContentBlock, importAllContentBlockDefaults, loadTermsDefaultBlock, type ContentBlockDTO } from '@/admin_cms/api/admin_cms.api'
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { createContentBlock, deleteContentBlock, getContentBlock, listContentBlockSummaries, updateContentBlock, importAllContentBlockDefaults, loadTermsDefaultBlock } from '@/admin_cms/api/admin_cms.api'
+
+const PAGE_SIZE = 200
 
 interface BlockFormValues {
   key: string
@@ -47,14 +49,27 @@ const ContentBlockForm: React.FC<{
 export const ContentBlocksTable: React.FC = () => {
   const qc = useQueryClient()
   const [createOpen, setCreateOpen] = React.useState(false)
-  const [editTarget, setEditTarget] = React.useState<ContentBlockDTO | null>(null)
+  const [editId, setEditId] = React.useState<number | null>(null)
   const [search, setSearch] = React.useState('')
   const [filterCategory, setFilterCategory] = React.useState<string>('all')
 
   const requestedCategory = filterCategory === 'all' ? undefined : filterCategory
-  const { data, isLoading } = useQuery({
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['cms-blocks', { category: requestedCategory }],
-    queryFn: () => listContentBlocks(requestedCategory ? { category: requestedCategory } : undefined),
+    queryFn: ({ pageParam }) => listContentBlockSummaries({ category: requestedCategory, after_id: pageParam, limit: PAGE_SIZE }),
+    initialPageParam: undefined as number | undefined,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+  })
+  const blocks = React.useMemo(() => data?.pages.flatMap(page => page.items) || [], [data])
+  // Search filters loaded rows only, so load every page while a search is active
+  React.useEffect(() => {
+    if (search && hasNextPage && !isFetchingNextPage) fetchNextPage()
+  }, [search, hasNextPage, isFetchingNextPage, fetchNextPage])
+  // Bodies are not part of the listing; load the full block only when editing
+  const { data: editTarget } = useQuery({
+    queryKey: ['cms-block', editId],
+    queryFn: () => getContentBlock(editId as number),
+    enabled: editId !== null,
   })
 
   const createMut = useMutation({
@@ -77,7 +92,7 @@ export const ContentBlocksTable: React.FC = () => {
       description: values.description,
       variables: values.variables ? values.variables.split(',').map(s => s.trim()).filter(Boolean) : [],
     }),
-    onSuccess: () => { qc.invalidateQueries({ queryKey: ['cms-blocks'] }); setEditTarget(null) }
+    onSuccess: () => { qc.invalidateQueries({ queryKey: ['cms-blocks'] }); qc.invalidateQueries({ queryKey: ['cms-block'] }); setEditId(null) }
   })
 
   const deleteMut = useMutation({ mutationFn: deleteContentBlock, onSuccess: () => qc.invalidateQueries({ queryKey: ['cms-blocks'] }) })
@@ -86,13 +101,13 @@ export const ContentBlocksTable: React.FC = () => {
 
   const categoryOptions = React.useMemo(() => {
     const preset = new Set<string>(['content', 'product_tour'])
-    for (const blk of data || []) {
+    for (const blk of blocks) {
       if (blk.category) preset.add(blk.category)
     }
     return Array.from(preset)
-  }, [data])
+  }, [blocks])
 
-  const items = (data || []).filter(it => {
+  const items = blocks.filter(it => {
     const matchesSearch = !search || it.key.includes(search) || it.title.toLowerCase().includes(search.toLowerCase()) || (it.category || '').toLowerCase().includes(search.toLowerCase())
     const matchesCategory = filterCategory === 'all' || it.category === filterCategory
     return matchesSearch && matchesCategory
@@ -143,7 +158,7 @@ export const ContentBlocksTable: React.FC = () => {
               </Table.Td>
               <Table.Td>
                 <Group justify="end" gap="xs">
-                  <Button size="xs" variant="light" onClick={() => setEditTarget(it)}>Edit</Button>
+                  <Button size="xs" variant="light" onClick={() => setEditId(it.id)}>Edit</Button>
                   <Button size="xs" color="gray" variant="outline" loading={deleteMut.isPending} onClick={() => deleteMut.mutate(it.id)}>Delete</Button>
                 </Group>
               </Table.Td>
@@ -156,6 +171,11 @@ export const ContentBlocksTable: React.FC = () => {
           )}
         </Table.Tbody>
       </Table>
+      {hasNextPage && (
+        <Group justify="center" mt="md">
+          <Button variant="default" loading={isFetchingNextPage} onClick={() => fetchNextPage()}>Load more</Button>
+        </Group>
+      )}
 
       {/* Create */}
       <Modal opened={createOpen} onClose={() => setCreateOpen(false)} title="New Content Block" size="lg">
@@ -163,12 +183,12 @@ export const ContentBlocksTable: React.FC = () => {
       </Modal>
 
       {/* Edit */}
-      <Modal opened={!!editTarget} onClose={() => setEditTarget(null)} title={`Edit: ${editTarget?.key}`} size="lg">
-        {editTarget && (
+      <Modal opened={editId !== null} onClose={() => setEditId(null)} title={`Edit: ${editTarget?.key ?? ''}`} size="lg">
+        {editTarget && editTarget.id === editId && (
           <ContentBlockForm
             initial={{ key: editTarget.key, category: editTarget.category, title: editTarget.title, html_content: editTarget.html_content, description: editTarget.description ?? '', variables: (editTarget.variables || []).join(', ') }}
             isEdit
-            onCancel={() => setEditTarget(null)}
+            onCancel={() => setEditId(null)}
             onSubmit={(values) => updateMut.mutate({ id: editTarget.id, values })}
             submitting={updateMut.isPending}
           />
@@ -1,9 +1,11 @@
 import React from 'react'
 import { Badge, Button, Group, LoadingOverlay, Modal, Paper, Select, Table, Text, TextInput, Textarea, Switch } from '@mantine/core'
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
-import { createNotificationTemplate, deleteNotificationTemplate, importAllNotificationDefaults, listNotificationTemplates, updateNotificationTemplate, type NotificationTemplateDTO } from '@/admin_cms/api/admin_cms.api'
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
+import { createNotificationTemplate, deleteNotificationTemplate, getNotificationTemplate, importAllNotificationDefaults, listNotificationTemplateSummaries, updateNotificationTemplate } from '@/admin_cms/api/admin_cms.api'
 import { notifications } from '@mantine/notifications'
 
+const PAGE_SIZE = 200
+
 interface FormValues {
   name: string
   template_type: 'email' | 'slack'
@@ -58,11 +60,30 @@ const NotificationTemplateForm: React.FC<{
 export const NotificationTemplatesTable: React.FC = () => {
   const qc = useQueryClient()
   const [createOpen, setCreateOpen] = React.useState(false)
-  const [editTarget, setEditTarget] = React.useState<NotificationTemplateDTO | null>(null)
+  const [editId, setEditId] = React.useState<number | null>(null)
   const [search, setSearch] = React.useState('')
   const [filterType, setFilterType] = React.useState<'email'|'slack'|'all'>('all')
 
-  const { data, isLoading } = useQuery({ queryKey: ['cms-notification-templates', { filterType }], queryFn: () => listNotificationTemplates({ template_type: filterType === 'all' ? undefined : filterType }) })
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ['cms-notification-templates', { filterType }],
+    queryFn: ({ pageParam }) => listNotificationTemplateSummaries({
+      template_type: filterType === 'all' ? undefined : filterType,
+      after_id: pageParam,
+      limit: PAGE_SIZE,
+    }),
+    initialPageParam: undefined as number | undefined,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+  })
+  // Search filters loaded rows only, so load every page while a search is active
+  React.useEffect(() => {
+    if (search && hasNextPage && !isFetchingNextPage) fetchNextPage()
+  }, [search, hasNextPage, isFetchingNextPage, fetchNextPage])
+  // Bodies are not part of the listing; load the full template only when editing
+  const { data: editTarget } = useQuery({
+    queryKey: ['cms-notification-template', editId],
+    queryFn: () => getNotificationTemplate(editId as number),
+    enabled: editId !== null,
+  })
 
   const createMut = useMutation({
     mutationFn: (values: FormValues) => createNotificationTemplate({
@@ -87,12 +108,12 @@ export const NotificationTemplatesTable: React.FC = () => {
       is_active: values.is_active,
       is_default: values.is_default,
     }),
-    onSuccess: () => { qc.invalidateQueries({ queryKey: ['cms-notification-templates'] }); setEditTarget(null) }
+    onSuccess: () => { qc.invalidateQueries({ queryKey: ['cms-notification-templates'] }); qc.invalidateQueries({ queryKey: ['cms-notification-template', editId] }); setEditId(null) }
   })
 
   const deleteMut = useMutation({ mutationFn: deleteNotificationTemplate, onSuccess: () => qc.invalidateQueries({ queryKey: ['cms-notification-templates'] }) })
 
-  const items = (data || []).filter(it => !search || it.name.includes(search) || it.category.toLowerCase().includes(search.toLowerCase()))
+  const items = (data?.pages.flatMap(page => page.items) || []).filter(it => !search || it.name.includes(search) || it.category.toLowerCase().includes(search.toLowerCase()))
 
   return (
     <Paper withBorder p="md" radius="md" pos="relative">
@@ -138,7 +159,7 @@ export const NotificationTemplatesTable: React.FC = () => {
               <Table.Td><Group gap={6}>{(it.variables || []).map(v => <Badge key={v} variant="light">{v}</Badge>)}</Group></Table.Td>
               <Table.Td>
                 <Group justify="end" gap="xs">
-                  <Button size="xs" variant="light" onClick={() => setEditTarget(it)}>Edit</Button>
+                  <Button size="xs" variant="light" onClick={() => setEditId(it.id)}>Edit</Button>
                   <Button size="xs" color="gray" variant="outline" loading={deleteMut.isPending} onClick={() => deleteMut.mutate(it.id)}>Delete</Button>
                 </Group>
               </Table.Td>
@@ -151,6 +172,11 @@ export const NotificationTemplatesTable: React.FC = () => {
           )}
         </Table.Tbody>
       </Table>
+      {hasNextPage && (
+        <Group justify="center" mt="md">
+          <Button variant="default" loading={isFetchingNextPage} onClick={() => fetchNextPage()}>Load more</Button>
+        </Group>
+      )}
 
       {/* Create */}
       <Modal opened={createOpen} onClose={() => setCreateOpen(false)} title="New Notification Template" size="lg">
@@ -158,8 +184,8 @@ export const NotificationTemplatesTable: React.FC = () => {
       </Modal>
 
       {/* Edit */}
-      <Modal opened={!!editTarget} onClose={() => setEditTarget(null)} title={`Edit: ${editTarget?.name}`} size="lg">
-        {editTarget && (
+      <Modal opened={editId !== null} onClose={() => setEditId(null)} title={`Edit: ${editTarget?.name ?? ''}`} size="lg">
+        {editTarget && editTarget.id === editId && (
           <NotificationTemplateForm
             initial={{
               name: editTarget.name,
@@ -172,7 +198,7 @@ export const NotificationTemplatesTable: React.FC = () => {
               is_default: editTarget.is_default,
             }}
             isEdit
-            onCancel={() => setEditTarget(null)}
+            onCancel={() => setEditId(null)}
             onSubmit={(values) => updateMut.mutate({ id: editTarget.id, values })}
             submitting={updateMut.isPending}
           />